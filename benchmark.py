@@ -0,0 +1,1012 @@
+"""
+Throughput benchmarks for pdf_syllabus_extractor.
+
+Usage:
+    python benchmark.py corpus DIR [--files N] [--units N] [--topics N] ...
+    python benchmark.py suite [--files N] [--units N] [--topics N] [--json OUT]
+    python benchmark.py render [--summaries N]
+    python benchmark.py topics [--kilobytes N]
+    python benchmark.py rules [--max-rules N]
+    python benchmark.py service [--requests N]
+    python benchmark.py backends [DIR] [--files N]
+    python benchmark.py index [--syllabi N]
+    python benchmark.py rows [--rows N]
+    python benchmark.py resources [--citations N]
+    python benchmark.py precheck [--files N] [--pages N]
+    python benchmark.py handbook [--courses N] [--workers N]
+    python benchmark.py sources [--files N]
+
+The synthetic corpus uses the ruled table layout extract_syllabus expects:
+subject-info row, Course Objectives with CO rows, the Unit/Details table with
+Roman-numeral rows and continuation rows, Course Outcomes, Text Books,
+Reference Books, Web Resources and Methods of Evaluation.
+"""
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import mmap
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pdfplumber
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Table, TableStyle
+from reportlab.platypus.doctemplate import LayoutError
+from PIL import Image
+
+from pdf_sources import iter_archive_pdfs
+from resource_dedup import deduplicate
+from syllabus_index import SyllabusIndex
+from syllabus_precheck import PRECHECK_PAGES, NotASyllabus
+from syllabus_profiler import StageTimer
+from table_backends import TABLE_BACKENDS, get_table_backend
+from unit_name_rules import UnitNameRules, load_unit_name_rules
+from pdf_syllabus_extractor import (SummaryRenderer, extract_syllabus, generate_pdf, iter_handbook,
+                                    peak_memory_mb, process_pdf_folder, split_topics,
+                                    split_units_into_topics)
+
+ROMAN = ['I', 'II', 'III', 'IV', 'V', 'VI']
+
+OBJECTIVES = [
+    "To gain knowledge on properties and classification of viruses",
+    "To understand pathogenic microorganisms of viruses and the mechanisms by which they cause diseases",
+    "To gain knowledge about reemerging viral infections and develop diagnostic skills",
+    "Understand the types of parasites causing infections in the intestine and blood",
+    "To develop skills in the diagnosis of parasitic infections",
+    "To gain knowledge on laboratory safety and quality control in microbiology",
+]
+
+WORDS = ("virus replication cell culture antigen antibody serology vaccine host immune "
+         "response genome capsid envelope transmission epidemiology diagnosis laboratory "
+         "specimen collection molecular assay pathogenesis infection control").split()
+
+
+def unit_text(rng, topics, topic_words):
+    """Comma-separated topics; every third one carries a parenthesised list."""
+    parts = []
+    for t in range(topics):
+        words = ' '.join(rng.choice(WORDS) for _ in range(topic_words)).capitalize()
+        if t % 3 == 2:
+            words += f" ({rng.choice(WORDS)}, {rng.choice(WORDS)}, {rng.choice(WORDS)})"
+        parts.append(words)
+    return ', '.join(parts)
+
+
+# Unit text per table cell; reportlab cannot lay out a cell taller than a page
+CELL_CHARS = 1200
+
+
+def cell_chunks(text, limit=CELL_CHARS):
+    """
+    Split comma-separated unit text at topic boundaries (not inside
+    parentheses) into pieces of at most limit characters, or one topic if
+    that is longer. Joined with spaces, the pieces give the text back.
+    """
+    chunks = []
+    for topic in re.split(r'(?<=,) (?![^()]*\))', text):
+        if chunks and len(chunks[-1]) + 1 + len(topic) <= limit:
+            chunks[-1] += " " + topic
+        else:
+            chunks.append(topic)
+    return chunks
+
+
+def sample_raw_units(units=5, topics=8, topic_words=4, seed=0):
+    """Raw units as extract_syllabus collects them before topic splitting."""
+    rng = random.Random(seed)
+    return [
+        {
+            "Unit_Number": u,
+            "Unit_Name": f"Sample Unit {u}",
+            "Raw_Content": unit_text(rng, topics, topic_words),
+        }
+        for u in range(1, units + 1)
+    ]
+
+
+def sample_syllabus(units=5, topics_per_unit=8):
+    """A syllabus dict shaped like extract_syllabus output."""
+    return {
+        "subject_info": {"credits": 4, "total_marks": 100, "cia_marks": 25, "external_marks": 75},
+        "units": [
+            {
+                "Unit_Number": u,
+                "Unit_Name": f"Sample Unit {u}",
+                "Topics": [f"Topic {u}.{t} (detail a, detail b)" for t in range(1, topics_per_unit + 1)],
+            }
+            for u in range(1, units + 1)
+        ],
+        "course_outcomes": {co: f"Students will be able to apply outcome {co} in practice" for co in range(1, 6)},
+        "resources": {
+            "text_books": ["Textbook of Microbiology, 10th ed"],
+            "reference_books": ["Medical Microbiology, 28th ed"],
+            "web_resources": ["https://example.org/syllabus"],
+        },
+    }
+
+
+def generate_syllabus_pdf(path, units=5, topics=8, topic_words=4, continuation_rows=1,
+                          extra_pages=0, repeat_header=False, seed=0):
+    """
+    Write one synthetic syllabus PDF.
+
+    units (at most 6) and topics/topic_words control the unit table size,
+    continuation_rows adds rows with an empty Unit column after each unit
+    (long unit text gets more of them, see cell_chunks),
+    extra_pages prepends cover/regulation pages without tables, and
+    repeat_header repeats the subject header row on every page, as Word does.
+    """
+    styles = getSampleStyleSheet()
+    story = []
+    for page in range(extra_pages):
+        story.append(Paragraph(f"University regulations, page {page + 1}. " * 40, styles['Normal']))
+        story.append(PageBreak())
+    story.append(syllabus_table(units, topics, topic_words, continuation_rows, repeat_header, seed))
+    try:
+        SimpleDocTemplate(path, pagesize=A4).build(story)
+    except LayoutError as e:
+        # Only a single topic longer than a page is left to overflow a cell
+        raise ValueError(f"{topic_words} words per topic do not fit in a table cell; "
+                         f"lower --topic-words") from e
+
+
+def generate_handbook_pdf(path, courses=40, page_breaks=False, **options):
+    """
+    Write a programme handbook: the syllabus tables of courses synthetic
+    courses (seeds 0..courses-1) one after another, each starting on a new
+    page with page_breaks or right below the previous one otherwise.
+    options are passed on to syllabus_table.
+    """
+    story = []
+    for seed in range(courses):
+        if seed and page_breaks:
+            story.append(PageBreak())
+        story.append(syllabus_table(seed=seed, **options))
+    SimpleDocTemplate(path, pagesize=A4).build(story)
+
+
+def syllabus_table(units=5, topics=8, topic_words=4, continuation_rows=1, repeat_header=False, seed=0):
+    """The ruled table of one synthetic syllabus, as a reportlab flowable."""
+    rng = random.Random(seed)
+    styles = getSampleStyleSheet()
+
+    def cell(text):
+        return Paragraph(text, styles['Normal'])
+
+    n_co = min(units, len(OBJECTIVES))
+    code = f"{300 + seed % 700}C{seed % 10}B"
+    rows = [
+        ["Subject Code", "Subject Name", "Category", "L", "T", "P", "Credits", "CIA", "External", "Total"],
+        [code, f"Synthetic Course {seed}", "Core", "4", "-", "-", "4", "25", "75", "100"],
+        ["Course Objectives", ""],
+    ]
+    for co in range(1, n_co + 1):
+        rows.append([f"CO{co}", cell(OBJECTIVES[co - 1])])
+    rows.append(["Unit", "Details", "No. of Hours", "Course Objectives"])
+    for u in range(min(units, len(ROMAN))):
+        first, *rest = cell_chunks(unit_text(rng, topics, topic_words))
+        rows.append([ROMAN[u], cell(first), "12", f"CO{u % n_co + 1}"])
+        for _ in range(continuation_rows):
+            rest += cell_chunks(unit_text(rng, max(1, topics // 4), topic_words))
+        for chunk in rest:
+            rows.append(["", cell(chunk), "", ""])
+    rows.append(["", "Total", str(12 * units), ""])
+    rows.append(["Course Outcomes", ""])
+    for co in range(1, n_co + 1):
+        rows.append([f"CO{co}", cell(f"Students will be able to {' '.join(rng.choice(WORDS) for _ in range(8))}")])
+    rows.append(["Text Books", ""])
+    rows.append(["1", cell(f"Textbook of {rng.choice(WORDS).title()} Microbiology, {rng.randint(1, 12)}th ed")])
+    rows.append(["Reference Books", ""])
+    rows.append(["1.", cell(f"Handbook of {rng.choice(WORDS).title()} Virology, {rng.randint(1, 12)}th ed")])
+    rows.append(["Web Resources", ""])
+    rows.append(["1", cell(f"https://example.org/{rng.choice(WORDS)}/{seed}")])
+    rows.append(["Methods of Evaluation", ""])
+
+    width = max(len(r) for r in rows)
+    rows = [r + [""] * (width - len(r)) for r in rows]
+    style = [
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+        ('FONTSIZE', (0, 0), (-1, -1), 6),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ]
+    # Section headers span the full width, as in the real syllabi
+    for i, row in enumerate(rows):
+        if row[0] and not any(row[1:]):
+            style.append(('SPAN', (0, i), (-1, i)))
+    table = Table(rows, colWidths=[60, 190] + [36] * (width - 2), repeatRows=1 if repeat_header else 0)
+    table.setStyle(TableStyle(style))
+    return table
+
+
+def generate_corpus(output_dir, files=20, **options):
+    """Write files synthetic syllabi to output_dir. Returns their paths."""
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for i in range(files):
+        path = os.path.join(output_dir, f"Synthetic_Course_{i:04d}.pdf")
+        generate_syllabus_pdf(path, seed=i, **options)
+        paths.append(path)
+    return paths
+
+
+NON_SYLLABUS_KINDS = ("circular", "timetable", "scanned")
+
+
+def generate_non_syllabus_pdf(path, kind, pages=10, seed=0):
+    """
+    Write one PDF of the kind that sits next to syllabi in input folders:
+    a text circular, a ruled timetable with subject codes on every page, or
+    scanned pages (images without a text layer).
+    """
+    rng = random.Random(seed)
+    if kind == "scanned":
+        scan = ImageReader(Image.new("L", (850, 1100), 235))
+        c = canvas.Canvas(path, pagesize=A4)
+        for _ in range(pages):
+            c.drawImage(scan, 40, 40, 515, 760)
+            c.showPage()
+        c.save()
+        return
+    styles = getSampleStyleSheet()
+    story = []
+    for page in range(pages):
+        if kind == "circular":
+            words = ' '.join(rng.choice(WORDS) for _ in range(300))
+            story.append(Paragraph(f"Circular No. {seed}/{page + 1}. All students are informed: {words}",
+                                   styles['Normal']))
+        else:
+            rows = [["Day", "9-10", "10-11", "11-12", "12-1", "2-3", "3-4"]]
+            for day in ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat") * 4:
+                rows.append([day] + [f"{rng.randint(300, 999)}C{rng.randint(0, 9)}B" for _ in range(6)])
+            table = Table(rows)
+            table.setStyle(TableStyle([('GRID', (0, 0), (-1, -1), 0.5, colors.black)]))
+            story.append(table)
+        story.append(PageBreak())
+    SimpleDocTemplate(path, pagesize=A4).build(story)
+
+
+def bench_precheck(files, pages):
+    """
+    Folder-mode cost of non-syllabus PDFs with and without the pre-check,
+    next to the same number of real (synthetic) syllabi, with and without
+    cover pages ahead of their table. Rejections are counted for the default
+    check and for the marker check.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = {
+            "syllabus": generate_corpus(os.path.join(tmp, "syllabus"), files),
+            "covers": generate_corpus(os.path.join(tmp, "covers"), files, extra_pages=PRECHECK_PAGES),
+        }
+        for kind in NON_SYLLABUS_KINDS:
+            corpus[kind] = []
+            for i in range(files):
+                path = os.path.join(tmp, f"{kind}_{i:04d}.pdf")
+                generate_non_syllabus_pdf(path, kind, pages, seed=i)
+                corpus[kind].append(path)
+
+        print(f"{files} PDF(s) per kind, {pages} page(s) per non-syllabus PDF, "
+              f"{PRECHECK_PAGES} cover page(s) before the covers' tables")
+        print(f"  {'kind':<10} {'full extract':>14} {'with precheck':>14}  rejected  {'with markers':>14}  rejected")
+        for kind, paths in corpus.items():
+            start = time.perf_counter()
+            for path in paths:
+                extract_syllabus(path)
+            full = time.perf_counter() - start
+            line = f"  {kind:<10} {full / len(paths) * 1000:11.1f} ms"
+            for markers in (False, True):
+                rejected = 0
+                start = time.perf_counter()
+                for path in paths:
+                    try:
+                        extract_syllabus(path, precheck_pages=PRECHECK_PAGES, precheck_markers=markers)
+                    except NotASyllabus:
+                        rejected += 1
+                checked = time.perf_counter() - start
+                line += f" {checked / len(paths) * 1000:11.1f} ms  {rejected:4d}/{len(paths)}"
+            print(line)
+
+
+def bench_handbook(courses, workers, page_breaks=False, repeat_header=False):
+    """
+    One handbook of courses syllabi, extracted serially and with workers
+    processes, against extracting the same courses as separate PDFs.
+    repeat_header repeats each course's header row on the pages it spans.
+    """
+    workers = workers or os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        handbook = os.path.join(tmp, "handbook.pdf")
+        generate_handbook_pdf(handbook, courses, page_breaks=page_breaks, repeat_header=repeat_header)
+        paths = generate_corpus(os.path.join(tmp, "courses"), courses, repeat_header=repeat_header)
+        pages = count_pages([handbook])
+
+        start = time.perf_counter()
+        separate = [extract_syllabus(path) for path in paths]
+        separate_seconds = time.perf_counter() - start
+        print(f"{courses} courses, {pages} handbook pages")
+        print(f"  separate PDFs       {separate_seconds:8.2f} s")
+        for n in sorted({1, workers}):
+            start = time.perf_counter()
+            extracted = list(iter_handbook(handbook, workers=n))
+            seconds = time.perf_counter() - start
+            same = sum(data == expected for (_, data), expected in zip(extracted, separate))
+            print(f"  handbook, {n:2d} worker(s) {seconds:8.2f} s  {pages / seconds:7.1f} pages/s"
+                  f"  {len(extracted)} course(s), {same}/{courses} match the separate PDFs")
+
+
+def bench_sources(files):
+    """
+    Extraction from an archive and from in-memory sources against the disk
+    round trip they replace: unpacking the archive, or writing an upload to
+    a temporary file, before extracting from the path.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = generate_corpus(os.path.join(tmp, "corpus"), files)
+        zip_path = os.path.join(tmp, "corpus.zip")
+        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for path in paths:
+                archive.write(path, os.path.basename(path))
+        tar_path = os.path.join(tmp, "corpus.tar.gz")
+        with tarfile.open(tar_path, 'w:gz') as archive:
+            for path in paths:
+                archive.add(path, os.path.basename(path))
+        expected = [extract_syllabus(path) for path in paths]
+
+        print(f"{files} syllabi")
+        for name, archive_path in (("zip", zip_path), ("tar.gz", tar_path)):
+            start = time.perf_counter()
+            unpacked = os.path.join(tmp, "unpacked")
+            shutil.unpack_archive(archive_path, unpacked)
+            from_disk = [extract_syllabus(os.path.join(unpacked, os.path.basename(path))) for path in paths]
+            unpack_seconds = time.perf_counter() - start
+            shutil.rmtree(unpacked)
+
+            start = time.perf_counter()
+            streamed = [extract_syllabus(data) for _, data in iter_archive_pdfs(archive_path)]
+            stream_seconds = time.perf_counter() - start
+            same = sum(a == b == c for a, b, c in zip(from_disk, streamed, expected))
+            print(f"  {name:6s} unpack + paths {unpack_seconds:7.2f} s   streamed {stream_seconds:7.2f} s"
+                  f"  ({files / stream_seconds:6.1f} PDFs/s)  {same}/{files} match")
+
+        blobs = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                blobs.append(f.read())
+
+        def via_temp_file(data):
+            # What an upload handler does without in-memory input
+            with tempfile.NamedTemporaryFile(suffix=".pdf", dir=tmp) as f:
+                f.write(data)
+                f.flush()
+                return extract_syllabus(f.name)
+
+        def via_mmap(path):
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return extract_syllabus(mapped)
+
+        def via_file(path):
+            with open(path, 'rb') as f:
+                return extract_syllabus(f)
+
+        cases = [
+            ("path", paths, extract_syllabus),
+            ("bytes via temp file", blobs, via_temp_file),
+            ("bytes", blobs, extract_syllabus),
+            ("memoryview", [memoryview(blob) for blob in blobs], extract_syllabus),
+            ("mmap", paths, via_mmap),
+            ("file object", paths, via_file),
+        ]
+        print("  per-PDF source")
+        for name, sources, extract in cases:
+            start = time.perf_counter()
+            results = [extract(source) for source in sources]
+            seconds = time.perf_counter() - start
+            same = sum(a == b for a, b in zip(results, expected))
+            print(f"    {name:20s} {seconds / files * 1000:8.2f} ms/PDF  {same}/{files} match")
+
+
+def count_pages(paths):
+    total = 0
+    for path in paths:
+        with pdfplumber.open(path) as pdf:
+            total += len(pdf.pages)
+    return total
+
+
+def run_suite(files, workers, units, topics, topic_words, extra_pages, repeat_header=False,
+              continuation_rows=1):
+    """Time each pipeline stage on a fresh synthetic corpus. Returns a results dict."""
+    results = {"files": files, "units": units, "topics": topics, "extra_pages": extra_pages,
+               "repeat_header": repeat_header, "continuation_rows": continuation_rows}
+    with tempfile.TemporaryDirectory() as tmp:
+        input_dir = os.path.join(tmp, "input")
+        paths = generate_corpus(input_dir, files, units=units, topics=topics,
+                                topic_words=topic_words, continuation_rows=continuation_rows,
+                                extra_pages=extra_pages, repeat_header=repeat_header)
+        pages = count_pages(paths)
+        results["pages"] = pages
+
+        start = time.perf_counter()
+        extracted = [extract_syllabus(path) for path in paths]
+        seconds = time.perf_counter() - start
+        complete = sum(len(data["units"]) == min(units, len(ROMAN)) for data in extracted)
+        results["extract_syllabus"] = {"seconds": seconds, "pages_per_s": pages / seconds,
+                                       "files_per_s": files / seconds, "complete": complete}
+
+        raw_units = [sample_raw_units(units, topics, topic_words, seed=i) for i in range(files)]
+        start = time.perf_counter()
+        for batch in raw_units:
+            split_units_into_topics(batch)
+        seconds = time.perf_counter() - start
+        results["topic_splitting"] = {"seconds": seconds, "units_per_s": files * units / seconds}
+
+        summaries = os.path.join(tmp, "summaries")
+        os.makedirs(summaries)
+        start = time.perf_counter()
+        for path, data in zip(paths, extracted):
+            name = os.path.basename(path)
+            generate_pdf(data, name, os.path.join(summaries, name))
+        seconds = time.perf_counter() - start
+        results["generate_pdf"] = {"seconds": seconds, "files_per_s": files / seconds}
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            process_pdf_folder(input_dir, os.path.join(tmp, "output"), workers=workers)
+        seconds = time.perf_counter() - start
+        results["process_pdf_folder"] = {"seconds": seconds, "workers": workers,
+                                         "pages_per_s": pages / seconds, "files_per_s": files / seconds}
+
+    results["peak_memory_mb"] = peak_memory_mb()
+    return results
+
+
+def print_suite(results):
+    print(f"Corpus: {results['files']} file(s), {results['pages']} page(s), "
+          f"{results['units']} units x {results['topics']} topics")
+    extract = results["extract_syllabus"]
+    print(f"  extract_syllabus    {extract['seconds']:8.2f} s  {extract['pages_per_s']:8.1f} pages/s"
+          f"  {extract['files_per_s']:8.1f} files/s  {extract['complete']}/{results['files']} with every unit")
+    split = results["topic_splitting"]
+    print(f"  topic splitting     {split['seconds']:8.2f} s  {split['units_per_s']:8.1f} units/s")
+    render = results["generate_pdf"]
+    print(f"  generate_pdf        {render['seconds']:8.2f} s  {render['files_per_s']:8.1f} files/s")
+    folder = results["process_pdf_folder"]
+    print(f"  process_pdf_folder  {folder['seconds']:8.2f} s  {folder['pages_per_s']:8.1f} pages/s"
+          f"  {folder['files_per_s']:8.1f} files/s  ({folder['workers'] or 'auto'} workers)")
+    if results["peak_memory_mb"] is not None:
+        print(f"  peak memory         {results['peak_memory_mb']:8.1f} MB")
+
+
+def bench_render(summaries):
+    """Per-summary render time with a fresh renderer per call vs. a shared one."""
+    data = sample_syllabus()
+    items = [(data, f"Course_{i:04d}.pdf") for i in range(summaries)]
+    results = {}
+    with tempfile.TemporaryDirectory() as out:
+        # Warm up reportlab's font and module caches so the first timing is fair
+        SummaryRenderer().render(data, "warmup.pdf", os.path.join(out, "warmup.pdf"))
+
+        # Building a renderer per call is what generate_pdf used to do:
+        # a new stylesheet, bullet style and document template every time.
+        start = time.perf_counter()
+        for data, name in items:
+            SummaryRenderer().render(data, name, os.path.join(out, "fresh.pdf"))
+        results["fresh renderer per summary"] = time.perf_counter() - start
+
+        renderer = SummaryRenderer()
+        start = time.perf_counter()
+        for data, name in items:
+            renderer.render(data, name, os.path.join(out, "shared.pdf"))
+        results["shared renderer"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        renderer.render_many(items, out)
+        results["render_many (separate files)"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        renderer.render_catalogue(items, os.path.join(out, "catalogue.pdf"))
+        results["render_catalogue (one PDF)"] = time.perf_counter() - start
+
+    print(f"Rendering {summaries} summaries")
+    for label, seconds in results.items():
+        print(f"  {label:32s} {seconds / summaries * 1000:8.2f} ms/summary")
+
+
+def legacy_split_topics(raw):
+    """The original character-by-character splitter, kept as the baseline."""
+    topics = []
+    current_topic = ""
+    paren_depth = 0
+    for char in raw:
+        if char == '(':
+            paren_depth += 1
+            current_topic += char
+        elif char == ')':
+            paren_depth -= 1
+            current_topic += char
+        elif char == ',' and paren_depth == 0:
+            if current_topic.strip():
+                topics.append(current_topic.strip())
+            current_topic = ""
+        else:
+            current_topic += char
+    if current_topic.strip():
+        topics.append(current_topic.strip())
+    return topics
+
+
+def bench_topics(kilobytes, repeat=20):
+    """Compare split_topics with the legacy loop on unit texts of growing size."""
+    rng = random.Random(0)
+    print(f"{'unit text':>10s} {'legacy':>12s} {'split_topics':>14s} {'speedup':>8s}")
+    size = 1
+    while size <= kilobytes:
+        raw = ""
+        while len(raw) < size * 1024:
+            raw += unit_text(rng, 8, 4) + ", "
+        raw = raw[:size * 1024]
+        assert split_topics(raw) == legacy_split_topics(raw)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            legacy_split_topics(raw)
+        legacy = (time.perf_counter() - start) / repeat
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            split_topics(raw)
+        current = (time.perf_counter() - start) / repeat
+
+        print(f"{size:>8d}KB {legacy * 1000:>10.3f}ms {current * 1000:>12.3f}ms {legacy / current:>7.1f}x")
+        size *= 4
+
+
+def bench_rules(max_rules, lookups=2000):
+    """Unit-name lookup time as the rule set grows, with memoization bypassed."""
+    base = load_unit_name_rules()
+    rng = random.Random(0)
+    objectives = [f"{OBJECTIVES[i % len(OBJECTIVES)]} {' '.join(rng.choice(WORDS) for _ in range(12))}"
+                  for i in range(lookups)]
+    print(f"{'rules':>8s} {'per lookup':>12s}")
+    size = 5
+    while size <= max_rules:
+        config = {
+            "strip_prefixes": base.strip_prefixes,
+            "rules": [{"name": name, "match": [sorted(c) for c in clauses]} for name, clauses in base.rules]
+                     + [{"name": f"Subject {i}", "match": [[f"subject pattern {i:06d}", rng.choice(WORDS)]]}
+                        for i in range(size - len(base.rules))],
+        }
+        rules = UnitNameRules(config)
+        start = time.perf_counter()
+        for text in objectives:
+            rules._lookup(text)
+        per_lookup = (time.perf_counter() - start) / lookups
+        print(f"{size:>8d} {per_lookup * 1e6:>10.1f}us")
+        size *= 10
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def bench_service(requests, cold_calls, port=8765):
+    """p50/p99 latency of the warm server's /extract against a cold --extract CLI call."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "Synthetic_Course.pdf")
+        generate_syllabus_pdf(pdf_path)
+        with open(pdf_path, 'rb') as f:
+            body = f.read()
+
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(here, "syllabus_server.py"), "--port", str(port), "--quiet"],
+            stdout=subprocess.PIPE, text=True)
+        try:
+            server.stdout.readline()  # "Serving ..." once warm
+            warm = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                conn = http.client.HTTPConnection("127.0.0.1", port)
+                conn.request("POST", "/extract", body=body, headers={"Content-Type": "application/pdf"})
+                response = conn.getresponse()
+                response.read()
+                conn.close()
+                warm.append(time.perf_counter() - start)
+                assert response.status == 200, response.status
+        finally:
+            server.terminate()
+            server.wait()
+
+        cold = []
+        for _ in range(cold_calls):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, os.path.join(here, "pdf_syllabus_extractor.py"),
+                            "--extract", pdf_path], check=True, stdout=subprocess.DEVNULL)
+            cold.append(time.perf_counter() - start)
+
+    print(f"{'path':28s} {'p50':>10s} {'p99':>10s}")
+    for label, samples in (("warm server /extract", warm), ("cold CLI --extract", cold)):
+        print(f"{label:28s} {percentile(samples, 50) * 1000:>8.1f}ms {percentile(samples, 99) * 1000:>8.1f}ms")
+
+
+def compare_backends(paths, names=None):
+    """
+    Run every table backend on the same pages and compare them.
+
+    Page layout is parsed once up front so only table extraction is timed.
+    Rows are compared position by position against the first backend, and
+    the final extract_syllabus dicts are compared per file.
+    """
+    names = names or list(TABLE_BACKENDS)
+    backends = {name: get_table_backend(name) for name in names}
+    seconds = dict.fromkeys(names, 0.0)
+    agreeing_rows = dict.fromkeys(names, 0)
+    total_rows = 0
+    pages = 0
+    differing_pages = []
+    for path in paths:
+        with pdfplumber.open(path) as pdf:
+            for page in pdf.pages:
+                page.chars, page.edges  # parse the layout outside the timed region
+                rows = {}
+                for name, backend in backends.items():
+                    start = time.perf_counter()
+                    tables = backend.extract_tables(page)
+                    seconds[name] += time.perf_counter() - start
+                    rows[name] = [row for table in tables for row in table]
+                reference = rows[names[0]]
+                page_rows = max(len(r) for r in rows.values())
+                total_rows += page_rows
+                for name in names:
+                    agreeing_rows[name] += sum(a == b for a, b in zip(reference, rows[name]))
+                    if rows[name] != reference:
+                        differing_pages.append((os.path.basename(path), page.page_number, name))
+                pages += 1
+                page.close()
+
+    files_agreeing = dict.fromkeys(names, 0)
+    for path in paths:
+        results = [extract_syllabus(path, backend=name) for name in names]
+        for name, result in zip(names, results):
+            files_agreeing[name] += result == results[0]
+
+    print(f"{len(paths)} file(s), {pages} page(s), {total_rows} row(s); reference backend: {names[0]}")
+    print(f"{'backend':12s} {'extract_tables':>14s} {'pages/s':>9s} {'rows agree':>11s} {'files agree':>12s}")
+    for name in names:
+        row_pct = 100 * agreeing_rows[name] / total_rows if total_rows else 100.0
+        print(f"{name:12s} {seconds[name]:>12.2f} s {pages / seconds[name]:>9.1f} {row_pct:>10.2f}% "
+              f"{files_agreeing[name]:>6d}/{len(paths)}")
+    fallback = getattr(backends.get("grid"), "fallback_pages", 0)
+    if fallback:
+        print(f"grid fell back to pdfplumber on {fallback} page(s)")
+    for file_name, page_number, name in differing_pages[:20]:
+        print(f"  rows differ: {file_name} page {page_number} ({name})")
+
+
+def bench_index(syllabi, queries=200):
+    """
+    Build a full-text index of synthetic syllabi and time queries against it,
+    next to loading and scanning the equivalent master JSON.
+    """
+    rng = random.Random(0)
+    master = {}
+    for i in range(syllabi):
+        data = sample_syllabus()
+        data["units"] = split_units_into_topics(sample_raw_units(seed=i))
+        if i % 100 == 0:
+            data["units"][0]["Topics"].append("Polymerase chain reaction (PCR) techniques")
+        data["resources"]["text_books"] = [f"{rng.choice(WORDS).title()} Handbook, edition {i % 12 + 1}"]
+        master[f"course_{i:06d}"] = {f"course_{i:06d}_Syllabus": data}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        master_path = os.path.join(tmp, "master_syllabus.json")
+        with open(master_path, 'w', encoding='utf-8') as f:
+            json.dump(master, f, indent=2)
+        del master
+
+        with SyllabusIndex(os.path.join(tmp, "index.db")) as index:
+            start = time.perf_counter()
+            index.build(master_path)
+            build_s = time.perf_counter() - start
+            entries = sum(index.stats()["entries"].values())
+            print(f"Indexed {syllabi} syllabi ({entries} entries) in {build_s:.2f}s")
+
+            upsert_key = "course_000001"
+            start = time.perf_counter()
+            for _ in range(20):
+                index.upsert(upsert_key, index.get(upsert_key))
+            print(f"  upsert one syllabus:        {(time.perf_counter() - start) / 20 * 1000:8.2f} ms")
+
+            cases = [
+                ("courses covering PCR", lambda: index.courses("PCR", limit=1000)),
+                ("text books citing 'Serology'", lambda: index.courses("serology", kinds=["text_book"])),
+                ("prefix 'polymer*'", lambda: index.search("polymer*")),
+                # The synthetic topics share a 20-word vocabulary, so these
+                # two match a large share of all entries: a worst case
+                ("common words 'vaccine antigen'", lambda: index.search("vaccine antigen")),
+                ("common prefix 'epidem*'", lambda: index.search("epidem*")),
+            ]
+            for label, query in cases:
+                samples = []
+                for _ in range(queries):
+                    start = time.perf_counter()
+                    query()
+                    samples.append(time.perf_counter() - start)
+                print(f"  {label + ':':<34s} {percentile(samples, 50) * 1000:6.2f} ms p50, "
+                      f"{percentile(samples, 95) * 1000:6.2f} ms p95")
+
+        start = time.perf_counter()
+        with open(master_path, encoding='utf-8') as f:
+            loaded = json.load(f)
+        hits = [key for key, wrapped in loaded.items()
+                if any("pcr" in topic.lower()
+                       for unit in wrapped[f"{key}_Syllabus"]["units"] for topic in unit["Topics"])]
+        print(f"  load + scan master JSON for PCR: {(time.perf_counter() - start) * 1000:8.1f} ms "
+              f"({len(hits)} courses)")
+
+
+class StaticTables:
+    """Table backend that returns the same prepared tables for every page."""
+    name = "static"
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    def extract_tables(self, page):
+        return self.tables
+
+
+def sample_rows(rows, width=10, seed=0):
+    """
+    A long syllabus table: subject-code rows, objectives, rows-many unit and
+    continuation rows, outcomes and resources, each row width cells wide.
+    """
+    rng = random.Random(seed)
+    pad = [None] * (width - 2)
+    table = []
+    for i in range(rows // 4):
+        table.append([f"{336 + i}C5B", "Core credit course", "4", "25", "75", "100"] + [None] * (width - 6))
+    table.append(["Course Objectives", None] + pad)
+    for co, objective in enumerate(OBJECTIVES[:5], 1):
+        table.append([f"CO{co}", objective] + pad)
+    table.append(["Unit", "Details"] + pad)
+    for i in range(rows // 2):
+        numeral = ROMAN[i % 5]
+        table.append([numeral, unit_text(rng, 4, 3), f"CO{i % 5 + 1}"] + [None] * (width - 3))
+        table.append(["", unit_text(rng, 2, 3)] + pad)
+    table.append(["", "Total"] + pad)
+    table.append(["Course Outcomes", None] + pad)
+    for co in range(1, rows // 8 + 1):
+        table.append([f"CO{co}", f"Students will be able to do outcome number {co} thoroughly"] + pad)
+    table.append(["Text Books", None] + pad)
+    table.append(["1.", "Ananthanarayan and Paniker's Textbook of Microbiology"] + pad)
+    table.append(["Web Resources", None] + pad)
+    table.append(["1.", "https://www.example.org/virology"] + pad)
+    table.append(["Methods of Evaluation", None] + pad)
+    return table
+
+
+def bench_rows(rows, repeat=5):
+    """Time extract_syllabus's row state machine alone on one long table."""
+    table = sample_rows(rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = os.path.join(tmp, "one_page.pdf")
+        generate_syllabus_pdf(pdf_path, units=1, topics=2)
+        best = None
+        for _ in range(repeat):
+            timer = StageTimer()
+            extract_syllabus(pdf_path, timer=timer, backend=StaticTables([table]))
+            seconds = timer.to_dict()["stages"]["state_machine"]["seconds"]
+            best = seconds if best is None else min(best, seconds)
+    print(f"{len(table)} rows of {len(table[0])} cells: {best * 1000:.1f} ms, "
+          f"{best / len(table) * 1e6:.2f} us per row")
+
+
+TITLE_WORDS = ("Textbook Medical Microbiology Virology Parasitology Principles Clinical Fields Essentials "
+               "Diagnostic Immunology Molecular Biology Infectious Diseases Laboratory Manual Practical "
+               "Human Tropical Introduction Concepts").split()
+
+
+def surname(rng):
+    """A made-up author surname, so distinct books have distinct authors."""
+    return "".join(rng.choice("bdgklmnprstv") + rng.choice("aeiou") for _ in range(rng.randint(2, 4))).title()
+
+
+def misspell(rng, text):
+    """One random typo, case, punctuation or wording change."""
+    choice = rng.randrange(7)
+    if choice == 0 and len(text) > 10:
+        i = rng.randrange(1, len(text) - 1)
+        return text[:i] + text[i + 1:]
+    if choice == 1 and len(text) > 10:
+        i = rng.randrange(1, len(text) - 2)
+        return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+    if choice == 2:
+        return text.upper() if rng.random() < 0.3 else text.lower()
+    if choice == 3:
+        return text.replace(" and ", " & ").replace(",", "")
+    if choice == 4:
+        return text.replace("Textbook", "Text book").replace("'s", "s")
+    if choice == 5:
+        return text + "."
+    return text
+
+
+def sample_citations(citations, books=3000, sites=500, seed=0):
+    """
+    A citations_frame of near-duplicate spellings of books and web resources,
+    with the true resource each citation refers to in a "truth" column.
+    """
+    rng = random.Random(seed)
+    bases = []
+    for _ in range(books):
+        authors = " and ".join(surname(rng) for _ in range(rng.randint(1, 2)))
+        title = " ".join(rng.sample(TITLE_WORDS, rng.randint(2, 4)))
+        bases.append(("book", f"{authors}'s {title}"))
+    for i in range(sites):
+        bases.append(("web", f"https://www.{rng.choice(TITLE_WORDS).lower()}{i}.org/"
+                             f"{rng.choice(TITLE_WORDS).lower()}-resources"))
+    rows = []
+    for c in range(citations):
+        truth = rng.randrange(len(bases))
+        group, base = bases[truth]
+        if group == "web":
+            text = base if rng.random() < 0.5 else base.replace("https://www.", "http://").rstrip("/")
+            if rng.random() < 0.3:
+                i = rng.randrange(8, len(text))
+                text = text[:i] + " " + text[i:]  # PDF text split inside the URL
+            kind = "web_resource"
+        else:
+            text = base if rng.random() < 0.4 else misspell(rng, base)
+            text += f", {rng.randint(1, 30)}th ed" if rng.random() < 0.7 else ""
+            kind = rng.choice(["text_book", "reference_book"])
+        rows.append((f"course_{c // 6:06d}", kind, text, truth))
+    return pd.DataFrame(rows, columns=["course", "kind", "citation", "truth"])
+
+
+def bench_resources(citations):
+    """Deduplication time and cluster quality against the known true resources."""
+    frame = sample_citations(citations)
+    start = time.perf_counter()
+    canonical, references = deduplicate(frame.drop(columns="truth"))
+    elapsed = time.perf_counter() - start
+    truth = frame["truth"].to_numpy()
+    found = references["resource_id"].to_numpy()
+    # Pairwise precision/recall from the cluster contingency table
+    pairs = lambda counts: float((counts * (counts - 1) / 2).sum())
+    both = pairs(pd.DataFrame({"truth": truth, "found": found}).value_counts().to_numpy())
+    precision = both / pairs(np.bincount(found))
+    recall = both / pairs(np.bincount(truth))
+    print(f"{len(frame)} citations of {frame['truth'].nunique()} resources -> "
+          f"{len(canonical)} canonical resources in {elapsed:.2f}s")
+    print(f"  pair precision {precision:.4f}, pair recall {recall:.4f}")
+
+
+def add_corpus_options(parser):
+    parser.add_argument("--files", type=int, default=20, help="number of synthetic PDFs")
+    parser.add_argument("--units", type=int, default=5, help="units per syllabus (max 6)")
+    parser.add_argument("--topics", type=int, default=8, help="topics per unit")
+    parser.add_argument("--topic-words", type=int, default=4, help="words per topic")
+    parser.add_argument("--extra-pages", type=int, default=0, help="cover pages before the table")
+    parser.add_argument("--continuation-rows", type=int, default=1,
+                        help="rows with an empty Unit column after each unit")
+    parser.add_argument("--repeat-header", action="store_true",
+                        help="repeat the subject header row on every page")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the syllabus extractor.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    corpus = sub.add_parser("corpus", help="write a synthetic syllabus corpus")
+    corpus.add_argument("output_dir")
+    add_corpus_options(corpus)
+
+    suite = sub.add_parser("suite", help="time every pipeline stage on a synthetic corpus")
+    add_corpus_options(suite)
+    suite.add_argument("--workers", type=int, default=None,
+                       help="workers for the process_pdf_folder stage (default: CPU count)")
+    suite.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+
+    render = sub.add_parser("render", help="summary PDF rendering")
+    render.add_argument("--summaries", type=int, default=200)
+
+    topics = sub.add_parser("topics", help="topic splitter against the legacy character loop")
+    topics.add_argument("--kilobytes", type=int, default=256, help="largest unit text to split")
+
+    rules = sub.add_parser("rules", help="unit-name rule lookup as the rule set grows")
+    rules.add_argument("--max-rules", type=int, default=50000)
+
+    service = sub.add_parser("service", help="warm server latency against a cold CLI call")
+    service.add_argument("--requests", type=int, default=200, help="warm requests to time")
+    service.add_argument("--cold-calls", type=int, default=20, help="cold CLI invocations to time")
+    service.add_argument("--port", type=int, default=8765)
+
+    backends = sub.add_parser("backends", help="speed and row agreement of the table backends")
+    backends.add_argument("input_dir", nargs="?", help="PDFs to compare on (default: synthetic corpus)")
+    add_corpus_options(backends)
+
+    index = sub.add_parser("index", help="full-text index build and query latency")
+    index.add_argument("--syllabi", type=int, default=20000)
+
+    rows = sub.add_parser("rows", help="row state machine cost per table row")
+    rows.add_argument("--rows", type=int, default=100000)
+
+    resources = sub.add_parser("resources", help="resource deduplication speed and accuracy")
+    resources.add_argument("--citations", type=int, default=100000)
+
+    precheck = sub.add_parser("precheck", help="non-syllabus rejection cost and accuracy")
+    precheck.add_argument("--files", type=int, default=10, help="PDFs per kind")
+    precheck.add_argument("--pages", type=int, default=10, help="pages per non-syllabus PDF")
+
+    handbook = sub.add_parser("handbook", help="multi-course handbook extraction, serial and parallel")
+    handbook.add_argument("--courses", type=int, default=40)
+    handbook.add_argument("--workers", type=int, default=None, help="default: CPU count")
+    handbook.add_argument("--page-breaks", action="store_true", help="start every course on a new page")
+    handbook.add_argument("--repeat-header", action="store_true",
+                          help="repeat each course's header row on every page")
+
+    sources = sub.add_parser("sources", help="archive and in-memory input against the disk round trip")
+    sources.add_argument("--files", type=int, default=40)
+    args = parser.parse_args()
+
+    if args.command == "corpus":
+        paths = generate_corpus(args.output_dir, args.files, units=args.units, topics=args.topics,
+                                topic_words=args.topic_words, continuation_rows=args.continuation_rows,
+                                extra_pages=args.extra_pages, repeat_header=args.repeat_header)
+        print(f"Wrote {len(paths)} PDF(s) to {args.output_dir}")
+    elif args.command == "suite":
+        results = run_suite(args.files, args.workers, args.units, args.topics,
+                            args.topic_words, args.extra_pages, args.repeat_header, args.continuation_rows)
+        print_suite(results)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+    elif args.command == "render":
+        bench_render(args.summaries)
+    elif args.command == "topics":
+        bench_topics(args.kilobytes)
+    elif args.command == "rules":
+        bench_rules(args.max_rules)
+    elif args.command == "service":
+        bench_service(args.requests, args.cold_calls, args.port)
+    elif args.command == "index":
+        bench_index(args.syllabi)
+    elif args.command == "rows":
+        bench_rows(args.rows)
+    elif args.command == "resources":
+        bench_resources(args.citations)
+    elif args.command == "precheck":
+        bench_precheck(args.files, args.pages)
+    elif args.command == "handbook":
+        bench_handbook(args.courses, args.workers, args.page_breaks, args.repeat_header)
+    elif args.command == "sources":
+        bench_sources(args.files)
+    elif args.command == "backends":
+        if args.input_dir:
+            paths = sorted(os.path.join(args.input_dir, f) for f in os.listdir(args.input_dir)
+                           if f.lower().endswith('.pdf'))
+            compare_backends(paths)
+        else:
+            with tempfile.TemporaryDirectory() as tmp:
+                paths = generate_corpus(tmp, args.files, units=args.units, topics=args.topics,
+                                        topic_words=args.topic_words,
+                                        continuation_rows=args.continuation_rows,
+                                        extra_pages=args.extra_pages, repeat_header=args.repeat_header)
+                compare_backends(paths)
@@ -0,0 +1,125 @@
+"""
+PDF input that is not a file on disk.
+
+extract_syllabus and the batch functions take a PDF as any of:
+- a path (str or os.PathLike)
+- bytes, bytearray or memoryview, e.g. an HTTP upload body
+- an mmap of a PDF file
+- a binary file object, seekable or not (a socket, a tar member stream)
+
+open_source turns each of them into something pdfplumber can open, copying
+the data only when the object cannot seek.
+
+iter_archive_pdfs streams the PDF members of a zip or tar archive one at a
+time, so a bundle of syllabi never has to be unpacked to disk.
+"""
+import io
+import mmap
+import os
+import posixpath
+import tarfile
+import zipfile
+
+
+class MemoryReader(io.RawIOBase):
+    """Seekable read-only binary file over a bytes-like object, without copying it."""
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read(self, size=-1):
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        data = self._view[self._pos:end].tobytes()
+        self._pos = max(self._pos, end)
+        return data
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if pos < 0:
+            raise ValueError("Negative seek position")
+        self._pos = pos
+        return pos
+
+    def tell(self):
+        return self._pos
+
+    def close(self):
+        if not self.closed:
+            # Lets the owner of the buffer (e.g. an mmap) close it
+            self._view.release()
+        super().close()
+
+
+def is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def open_source(source):
+    """
+    A path or seekable binary file for pdfplumber.open(). Paths, mmaps and
+    seekable files are returned as they are, bytes objects are wrapped
+    without a copy, and a file that cannot seek is read into memory once.
+    """
+    if is_path(source) or isinstance(source, mmap.mmap):
+        return source
+    if isinstance(source, bytes):
+        # BytesIO shares an immutable bytes buffer until it is written to
+        return io.BytesIO(source)
+    if isinstance(source, (bytearray, memoryview)):
+        return MemoryReader(source)
+    if hasattr(source, "read"):
+        seekable = getattr(source, "seekable", None)
+        if seekable is not None and seekable():
+            return source
+        return io.BytesIO(source.read())
+    raise TypeError(f"Cannot read a PDF from {type(source).__name__}")
+
+
+def is_archive(path):
+    """Whether path is a zip or tar (optionally compressed) file."""
+    if not os.path.isfile(path):
+        return False
+    return zipfile.is_zipfile(path) or tarfile.is_tarfile(path)
+
+
+def member_path(name):
+    """An archive member name as a plain relative path: "./bio/a.pdf" -> "bio/a.pdf"."""
+    return posixpath.normpath(name).lstrip("/")
+
+
+def iter_archive_pdfs(path):
+    """
+    Yield (member path, bytes) for every PDF in a zip or tar archive, in
+    archive order, with member paths normalized by member_path. Members are
+    read one at a time; tar archives, compressed or not, are read front to
+    back in stream mode without seeking.
+    """
+    if zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and info.filename.lower().endswith('.pdf'):
+                    yield member_path(info.filename), archive.read(info)
+    else:
+        with tarfile.open(path, mode='r|*') as archive:
+            for member in archive:
+                if member.isfile() and member.name.lower().endswith('.pdf'):
+                    yield member_path(member.name), archive.extractfile(member).read()
@@ -2,18 +2,54 @@ import pdfplumber
 import json
 import re
 import os
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_LEFT
+import sys
+import time
+import shutil
+import tempfile
+import argparse
+import cProfile
+import pstats
+import mmap
+from collections import namedtuple
+from functools import partial, lru_cache
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+from syllabus_cache import ExtractionCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES
+from unit_name_rules import load_unit_name_rules
+from section_rules import load_section_rules, normalize_row, row_text
+from table_backends import DEFAULT_BACKEND, TABLE_BACKENDS, get_table_backend
+from syllabus_profiler import StageTimer, NULL_TIMER, build_report, format_report
+from syllabus_index import SyllabusIndex
+from syllabus_precheck import PRECHECK_PAGES, NotASyllabus, classify_pages
+from pdf_sources import open_source, is_path, is_archive, iter_archive_pdfs
+from syllabus_workers import SupervisedPool, DEFAULT_TIMEOUT, DEFAULT_MAX_FILES, memory_limits_supported
 
 def clean_text(text):
     if not text:
         return ""
     return text.replace('\n', ' ').strip()
 
-def extract_unit_name_from_objective(objective_text):
+_unit_name_rules = None
+
+def get_unit_name_rules():
+    """Return this process's compiled unit-name rules, loading unit_name_rules.json on first use."""
+    global _unit_name_rules
+    if _unit_name_rules is None:
+        _unit_name_rules = load_unit_name_rules()
+    return _unit_name_rules
+
+_section_rules = None
+
+def get_section_rules():
+    """Return this process's compiled section transitions, loading section_rules.json on first use."""
+    global _section_rules
+    if _section_rules is None:
+        _section_rules = load_section_rules()
+    return _section_rules
+
+def extract_unit_name_from_objective(objective_text, rules=None):
     """
     Extract a meaningful, short unit name from the course objective.
     Examples:
@@ -22,232 +58,64 @@ def extract_unit_name_from_objective(objective_text):
     - "To gain knowledge about reemerging viral infections..." -> "Emerging & Reemerging Viral Infections"
     - "Understand the types of parasites causing infections..." -> "Parasitic Infections"
     - "To develop skills in the diagnosis of parasitic infections" -> "Parasitic Diagnosis Techniques"
+
+    The patterns live in unit_name_rules.json (see UnitNameRules); new
+    departments are added there rather than here. Objectives matching no rule
+    fall back to the first few words, title-cased.
     """
-    text_lower = objective_text.lower()
-    
-    # Define patterns and corresponding short names
-    if "properties and classification of viruses" in text_lower:
-        return "Virus Properties & Classification"
-    elif "pathogenic microorganisms of viruses" in text_lower or "mechanisms by which they cause" in text_lower:
-        return "Viral Pathogenesis & Disease Mechanisms"
-    elif "reemerging viral infections" in text_lower or "diagnostic skills" in text_lower and "viral" in text_lower:
-        return "Emerging & Reemerging Viral Infections"
-    elif "types of parasites" in text_lower and "intestine" in text_lower:
-        return "Intestinal Parasitic Infections"
-    elif "diagnosis of parasitic" in text_lower or "skills in the diagnosis" in text_lower:
-        return "Parasitic Diagnosis Techniques"
-    else:
-        # Fallback: extract key nouns and create a generic name
-        # Remove common starter phrases
-        text = objective_text
-        for phrase in ["To gain knowledge on", "To gain knowledge about", "To understand", 
-                       "To develop skills in", "Understand the"]:
-            if text.startswith(phrase):
-                text = text[len(phrase):].strip()
-                break
-        
-        # Take first 5-8 words and capitalize
-        words = text.split()[:6]
-        short_name = ' '.join(words)
-        if short_name.endswith(','):
-            short_name = short_name[:-1]
-        if short_name.endswith('.'):
-            short_name = short_name[:-1]
-        return short_name.title()
-
-def extract_syllabus(pdf_path):
-    units = []
-    course_objectives = {}
-    course_outcomes = {}
-    subject_info = {}
-    resources = {
-        "text_books": [],
-        "reference_books": [],
-        "web_resources": []
-    }
-    current_unit = None
-    state = "LOOKING_FOR_SUBJECT_INFO"
-    current_resource_type = None
+    return (rules or get_unit_name_rules()).lookup(objective_text)
+
+TOPIC_DELIMITERS = ","
+TOPIC_BRACKETS = "()"
+
+@lru_cache(maxsize=None)
+def _topic_token_pattern(delimiters, brackets):
+    return re.compile("[" + re.escape(delimiters + brackets) + "]")
+
+def split_topics(raw, delimiters=TOPIC_DELIMITERS, brackets=TOPIC_BRACKETS):
+    """
+    Split unit text into topics on delimiters that are outside brackets.
+
+    delimiters is a string of single-character separators (e.g. ",;–") and
+    brackets a string of open/close pairs (e.g. "()[]"); all bracket kinds
+    share one nesting depth. Only delimiter and bracket characters are
+    visited and each topic is sliced out once, so this is linear in the text.
+    """
+    openers = set(brackets[0::2])
+    closers = set(brackets[1::2])
+    topics = []
+    start = 0
+    depth = 0
     
-    roman_to_int = {'I': 1, 'II': 2, 'III': 3, 'IV': 4, 'V': 5, 'VI': 6}
+    for match in _topic_token_pattern(delimiters, brackets).finditer(raw):
+        char = match.group()
+        if char in openers:
+            depth += 1
+        elif char in closers:
+            depth -= 1
+        elif depth == 0:
+            # Only split on delimiters outside of brackets
+            topic = raw[start:match.start()].strip()
+            if topic:
+                topics.append(topic)
+            start = match.end()
     
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            tables = page.extract_tables()
-            for table in tables:
-                for row in table:
-                    # Handle cases where row might be shorter than expected
-                    if not row or len(row) < 2:
-                        continue
-                        
-                    col0 = str(row[0]).strip() if row[0] else ""
-                    col1 = str(row[1]).strip() if row[1] else ""
-                    
-                    # Extract subject information (code, name, credits, marks)
-                    if state == "LOOKING_FOR_SUBJECT_INFO":
-                        # Look for subject code pattern
-                        if col0 and len(col0) < 10 and any(char.isdigit() for char in col0):
-                            # Extract marks information
-                            for i, cell in enumerate(row):
-                                cell_str = str(cell).strip() if cell else ""
-                                if cell_str.isdigit() and int(cell_str) in [25, 75, 100]:
-                                    if int(cell_str) == 25:
-                                        subject_info["cia_marks"] = 25
-                                    elif int(cell_str) == 75:
-                                        subject_info["external_marks"] = 75
-                                    elif int(cell_str) == 100:
-                                        subject_info["total_marks"] = 100
-                            
-                            # Extract credits
-                            for i, cell in enumerate(row):
-                                cell_str = str(cell).strip() if cell else ""
-                                if cell_str.isdigit() and int(cell_str) <= 10 and "credit" in str(row).lower():
-                                    subject_info["credits"] = int(cell_str)
-                        
-                        if "Course Objectives" in col0:
-                            state = "LOOKING_FOR_OBJECTIVES"
-                            continue
-                    
-                    # Extract course objectives
-                    if state == "LOOKING_FOR_OBJECTIVES":
-                        if col0.startswith("CO") and col0[2:].isdigit():
-                            co_num = int(col0[2:])
-                            # Try to find the objective text in the row
-                            objective_text = ""
-                            for cell in row[1:]:
-                                if cell and len(str(cell).strip()) > 20:  # Look for substantial text
-                                    objective_text = clean_text(str(cell))
-                                    break
-                            if objective_text:
-                                # Extract key concepts from objective and create a short, meaningful name
-                                short_name = extract_unit_name_from_objective(objective_text)
-                                course_objectives[co_num] = short_name
-                        elif ("Unit" in col0 or "UNIT" in col0) and ("Details" in col1 or any("Details" in str(c) for c in row if c)):
-                            state = "PROCESSING_UNITS"
-                            continue
-                            
-                    if state == "PROCESSING_UNITS":
-                        # Check if it's a new unit (Roman Numeral)
-                        if col0 in roman_to_int:
-                            # Save previous unit if exists
-                            if current_unit:
-                                units.append(current_unit)
-                            
-                            unit_num = roman_to_int[col0]
-                            
-                            # Find the content text (usually in col1 or col2)
-                            raw_text = ""
-                            for cell in row[1:]:
-                                if cell and len(str(cell).strip()) > 20:  # Look for substantial text
-                                    raw_text = clean_text(str(cell))
-                                    break
-                            
-                            # Get course objective for this unit - check multiple columns
-                            unit_name = f"Unit {col0}"
-                            for i, cell in enumerate(row):
-                                if cell and str(cell).strip().startswith("CO") and str(cell).strip()[2:].isdigit():
-                                    co_ref = str(cell).strip()
-                                    co_num = int(co_ref[2:])
-                                    unit_name = course_objectives.get(co_num, f"Unit {col0}")
-                                    break
-                            
-                            current_unit = {
-                                "Unit_Number": unit_num,
-                                "Unit_Name": unit_name, 
-                                "Raw_Content": raw_text
-                            }
-                        
-                        # Check for continuation (Empty first col, content in second or third)
-                        elif (not col0 or col0 == '') and current_unit:
-                            for cell in row[1:]:
-                                if cell and len(str(cell).strip()) > 10:
-                                    current_unit["Raw_Content"] += " " + clean_text(str(cell))
-                                    break
-                        
-                        # Check if we hit the end of the syllabus table
-                        # Usually indicated by "Total" or "Course Outcomes" or just a new section
-                        elif "Total" in col1 or "Course Outcomes" in col0:
-                            if current_unit:
-                                units.append(current_unit)
-                                current_unit = None
-                            state = "LOOKING_FOR_OUTCOMES"
-                            continue
-                    
-                    # Extract course outcomes
-                    if state == "LOOKING_FOR_OUTCOMES":
-                        if col0.startswith("CO") and col0[2:].isdigit():
-                            co_num = int(col0[2:])
-                            # Find the outcome text
-                            outcome_text = ""
-                            for cell in row[1:]:
-                                if cell and len(str(cell).strip()) > 20:
-                                    outcome_text = clean_text(str(cell))
-                                    break
-                            if outcome_text:
-                                course_outcomes[co_num] = outcome_text
-                        elif "Text Books" in col0 or "Text Books" in str(row):
-                            state = "LOOKING_FOR_RESOURCES"
-                            current_resource_type = "text_books"
-                            continue
-                    
-                    # Extract resources
-                    if state == "LOOKING_FOR_RESOURCES":
-                        # Check for section headers
-                        if "References Books" in col0 or "Reference Books" in col0:
-                            current_resource_type = "reference_books"
-                            continue
-                        elif "Web Resources" in col0:
-                            current_resource_type = "web_resources"
-                            continue
-                        elif "Methods of Evaluation" in col0 or "Methods of Assessment" in col0:
-                            state = "DONE"
-                            break
-                        
-                        # Extract resource entries (numbered items)
-                        if col0 and (col0.isdigit() or col0.endswith('.')):
-                            resource_text = ""
-                            for cell in row[1:]:
-                                if cell and len(str(cell).strip()) > 10:
-                                    resource_text = clean_text(str(cell))
-                                    break
-                            if resource_text and current_resource_type:
-                                resources[current_resource_type].append(resource_text)
-                
-                if state == "DONE":
-                    break
-            if state == "DONE":
-                break
-                
-    # Post-process units to split topics
+    # Add the last topic
+    topic = raw[start:].strip()
+    if topic:
+        topics.append(topic)
+    return topics
+
+def split_units_into_topics(units, delimiters=TOPIC_DELIMITERS, brackets=TOPIC_BRACKETS):
+    """
+    Turn raw units (Unit_Number, Unit_Name, Raw_Content) into final units with
+    a Topics list, dropping a first topic that just repeats the unit name.
+    """
     final_units = []
     int_to_roman = {1: 'I', 2: 'II', 3: 'III', 4: 'IV', 5: 'V', 6: 'VI'}
     
     for unit in units:
-        raw = unit["Raw_Content"]
-        
-        # Split by commas, but merge items that are part of parentheses
-        topics = []
-        current_topic = ""
-        paren_depth = 0
-        
-        for char in raw:
-            if char == '(':
-                paren_depth += 1
-                current_topic += char
-            elif char == ')':
-                paren_depth -= 1
-                current_topic += char
-            elif char == ',' and paren_depth == 0:
-                # Only split on commas outside of parentheses
-                if current_topic.strip():
-                    topics.append(current_topic.strip())
-                current_topic = ""
-            else:
-                current_topic += char
-        
-        # Add the last topic
-        if current_topic.strip():
-            topics.append(current_topic.strip())
+        topics = split_topics(unit["Raw_Content"], delimiters, brackets)
         
         # Remove the first topic if it's too similar to the unit name
         unit_num = unit["Unit_Number"]
@@ -270,6 +138,61 @@ def extract_syllabus(pdf_path):
             "Unit_Name": unit["Unit_Name"],
             "Topics": topics
         })
+    return final_units
+
+def page_may_have_tables(page):
+    """
+    Cheap pre-scan deciding whether page.extract_tables() can return anything.
+
+    extract_tables() uses the "lines" strategy, so a table needs ruling edges in
+    both directions, and a table without any chars only yields empty rows that
+    the state machine ignores. Pages failing either test (cover text, scanned
+    appendices, plain regulations) are skipped without changing the result.
+    Section header text is deliberately not used as a gate: continuation pages
+    of the unit table carry no header but still hold rows.
+    """
+    if not page.chars:
+        return False
+    return bool(page.horizontal_edges) and bool(page.vertical_edges)
+
+def release_page(pdf, page):
+    """
+    Drop everything pdfplumber and pdfminer cached while reading a page: the
+    page's layout tree and objects, and the document's parsed-object cache.
+    Referenced objects are simply re-parsed if a later page needs them.
+    """
+    page.close()
+    doc = getattr(pdf, "doc", None)
+    for cache_name in ("_cached_objs", "_parsed_objs"):
+        cache = getattr(doc, cache_name, None)
+        if isinstance(cache, dict):
+            cache.clear()
+
+def peak_memory_mb():
+    """Peak RSS in MB of this process and its reaped children, or None if unknown."""
+    if resource is None:
+        return None
+    peak_kb = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                  resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in kilobytes on Linux but bytes on macOS
+    if sys.platform == "darwin":
+        peak_kb /= 1024
+    return peak_kb / 1024
+
+def new_course():
+    """Empty containers for one course: units, objectives, outcomes, subject info, resources."""
+    resources = {
+        "text_books": [],
+        "reference_books": [],
+        "web_resources": []
+    }
+    return [], {}, {}, {}, resources
+
+def syllabus_result(subject_info, units, course_outcomes, resources, timer=NULL_TIMER):
+    """The extract_syllabus dict for one course's collected rows."""
+    # Post-process units to split topics
+    with timer.stage("topic_split"):
+        final_units = split_units_into_topics(units)
     
     # Return comprehensive data
     return {
@@ -279,6 +202,372 @@ def extract_syllabus(pdf_path):
         "resources": resources
     }
 
+def extract_syllabus(pdf_path, stats=None, stream_pages=True, timer=NULL_TIMER,
+                     backend=DEFAULT_BACKEND, precheck_pages=0, precheck_markers=False):
+    """
+    Extract subject info, units, outcomes and resources from the first course
+    of a syllabus PDF (a path, the PDF in memory, or a binary file object).
+    stats gets the "pages" scanned and "pages_skipped"; timer records stage
+    times; backend is a table_backends name or object. With precheck_pages,
+    NotASyllabus is raised for a scan (see syllabus_precheck).
+    """
+    courses = iter_courses(pdf_path, stats, stream_pages, timer, backend, precheck_pages,
+                           precheck_markers=precheck_markers)
+    try:
+        for _, syllabus_data in courses:
+            return syllabus_data
+    finally:
+        # Stops reading pages and records the page counts
+        courses.close()
+    units, _, course_outcomes, subject_info, resources = new_course()
+    return syllabus_result(subject_info, units, course_outcomes, resources, timer)
+
+def iter_courses(pdf_path, stats=None, stream_pages=True, timer=NULL_TIMER,
+                 backend=DEFAULT_BACKEND, precheck_pages=0, first_page=1, last_page=None,
+                 precheck_markers=False):
+    """
+    Yield (subject_code, syllabus dict) for every course in a PDF, in page order.
+
+    Between courses, a subject code row (subject_code in section_rules.json)
+    opens the next course. Inside a course, a subject header row (course_start)
+    followed by a subject code closes it and opens the next. Word repeats the
+    header row, sometimes with the code row, at the top of every page of a
+    long table, so a header alone, or the code of the course just read,
+    never opens one. Each course is yielded once the page it ends on is done.
+    subject_code is the course's code, or None if it had none.
+
+    first_page and last_page (1-based, inclusive) limit the scan to the
+    courses that start in that page range. From a first_page after 1, rows
+    are ignored up to the first subject code row. A course still open after
+    last_page is read to its end, and the scan stops where the next course
+    opens. stats then also gets "rows_ignored", the rows after a course's
+    end that opened none.
+
+    The other arguments are as for extract_syllabus.
+    """
+    units, course_objectives, course_outcomes, subject_info, resources = new_course()
+    current_unit = None
+    subject_code = None
+    header_pending = False
+    after_course = False
+    # A later range leaves rows before its first subject code row to the range before
+    state = "BETWEEN_COURSES" if first_page > 1 else "LOOKING_FOR_SUBJECT_INFO"
+    current_resource_type = None
+    
+    roman_to_int = {'I': 1, 'II': 2, 'III': 3, 'IV': 4, 'V': 5, 'VI': 6}
+    
+    pages_scanned = 0
+    pages_skipped = 0
+    rows_ignored = 0
+    table_backend = get_table_backend(backend) if isinstance(backend, str) else backend
+    section_rules = get_section_rules()
+    
+    try:
+        with timer.stage("pdfplumber.open"):
+            pdf = pdfplumber.open(open_source(pdf_path))
+        with pdf:
+            if precheck_pages:
+                # Lays out the first pages; the loop below reuses their layout
+                with timer.stage("precheck"):
+                    rejected = classify_pages(pdf.pages[:precheck_pages], precheck_markers)
+                if rejected:
+                    raise NotASyllabus(*rejected)
+            finished = False
+            for page in pdf.pages[first_page - 1:]:
+                page_no = page.page_number
+                if last_page is not None and page_no > last_page and state == "BETWEEN_COURSES":
+                    # Any course starting from here belongs to the next range
+                    break
+                pages_scanned += 1
+                # The pre-scan is where pdfminer lays out the page
+                with timer.stage("page_layout", page_no):
+                    may_have_tables = page_may_have_tables(page)
+                if not may_have_tables:
+                    pages_skipped += 1
+                    if stream_pages:
+                        release_page(pdf, page)
+                    continue
+                with timer.stage("extract_tables", page_no):
+                    tables = table_backend.extract_tables(page)
+                if stream_pages:
+                    release_page(pdf, page)
+                completed = []
+                started = timer.start()
+                for table in tables:
+                    for raw_row in table:
+                        # Normalize once; every check below reads these cells
+                        cells = normalize_row(raw_row)
+                        if cells is None:
+                            continue
+                        col0 = cells[0]
+                        
+                        # A new subject code opens the next course between
+                        # courses, or inside one right after a header row; the
+                        # same code means the rows were repeated on a new page
+                        opens_course = False
+                        if header_pending:
+                            header_pending = False
+                            if section_rules.is_subject_code(col0):
+                                if state == "LOOKING_FOR_SUBJECT_INFO":
+                                    # The code taken so far was some other short cell
+                                    subject_code = col0
+                                else:
+                                    opens_course = col0 != subject_code
+                        elif state == "BETWEEN_COURSES":
+                            opens_course = col0 != subject_code and section_rules.is_subject_code(col0)
+                        if opens_course:
+                            if state != "BETWEEN_COURSES":
+                                if current_unit:
+                                    units.append(current_unit)
+                                completed.append((subject_code, subject_info, units, course_outcomes, resources))
+                            if last_page is not None and page_no > last_page:
+                                finished = True
+                                break
+                            units, course_objectives, course_outcomes, subject_info, resources = new_course()
+                            current_unit = None
+                            subject_code = None
+                            current_resource_type = None
+                            state = "LOOKING_FOR_SUBJECT_INFO"
+                        
+                        # Extract subject information (code, name, credits, marks)
+                        if state == "LOOKING_FOR_SUBJECT_INFO":
+                            # Look for subject code pattern
+                            if col0 and len(col0) < 10 and any(char.isdigit() for char in col0):
+                                if subject_code is None and section_rules.is_subject_code(col0):
+                                    subject_code = col0
+                                # Extract marks information
+                                for cell_str in cells:
+                                    if cell_str.isdigit() and int(cell_str) in [25, 75, 100]:
+                                        if int(cell_str) == 25:
+                                            subject_info["cia_marks"] = 25
+                                        elif int(cell_str) == 75:
+                                            subject_info["external_marks"] = 75
+                                        elif int(cell_str) == 100:
+                                            subject_info["total_marks"] = 100
+                                
+                                # Extract credits
+                                if "credit" in row_text(cells).lower():
+                                    for cell_str in cells:
+                                        if cell_str.isdigit() and int(cell_str) <= 10:
+                                            subject_info["credits"] = int(cell_str)
+                        
+                        # Extract course objectives
+                        elif state == "LOOKING_FOR_OBJECTIVES":
+                            if col0.startswith("CO") and col0[2:].isdigit():
+                                co_num = int(col0[2:])
+                                # Try to find the objective text in the row
+                                objective_text = ""
+                                for cell_str in cells[1:]:
+                                    if len(cell_str) > 20:  # Look for substantial text
+                                        objective_text = clean_text(cell_str)
+                                        break
+                                if objective_text:
+                                    # Extract key concepts from objective and create a short, meaningful name
+                                    short_name = extract_unit_name_from_objective(objective_text)
+                                    course_objectives[co_num] = short_name
+                                continue
+                                
+                        elif state == "PROCESSING_UNITS":
+                            # Check if it's a new unit (Roman Numeral)
+                            if col0 in roman_to_int:
+                                # Save previous unit if exists
+                                if current_unit:
+                                    units.append(current_unit)
+                                
+                                unit_num = roman_to_int[col0]
+                                
+                                # Find the content text (usually in col1 or col2)
+                                raw_text = ""
+                                for cell_str in cells[1:]:
+                                    if len(cell_str) > 20:  # Look for substantial text
+                                        raw_text = clean_text(cell_str)
+                                        break
+                                
+                                # Get course objective for this unit - check multiple columns
+                                unit_name = f"Unit {col0}"
+                                for cell_str in cells:
+                                    if cell_str.startswith("CO") and cell_str[2:].isdigit():
+                                        co_num = int(cell_str[2:])
+                                        unit_name = course_objectives.get(co_num, f"Unit {col0}")
+                                        break
+                                
+                                current_unit = {
+                                    "Unit_Number": unit_num,
+                                    "Unit_Name": unit_name, 
+                                    "Raw_Content": raw_text
+                                }
+                                continue
+                            
+                            # Check for continuation (Empty first col, content in second or third)
+                            elif not col0 and current_unit:
+                                for cell_str in cells[1:]:
+                                    if len(cell_str) > 10:
+                                        current_unit["Raw_Content"] += " " + clean_text(cell_str)
+                                        break
+                                continue
+                        
+                        # Extract course outcomes
+                        elif state == "LOOKING_FOR_OUTCOMES":
+                            if col0.startswith("CO") and col0[2:].isdigit():
+                                co_num = int(col0[2:])
+                                # Find the outcome text
+                                outcome_text = ""
+                                for cell_str in cells[1:]:
+                                    if len(cell_str) > 20:
+                                        outcome_text = clean_text(cell_str)
+                                        break
+                                if outcome_text:
+                                    course_outcomes[co_num] = outcome_text
+                                continue
+                        
+                        # A subject header row may open the next course, which
+                        # the row after it decides. Rows the current section
+                        # consumed above are never one.
+                        if col0 and section_rules.starts_course(cells):
+                            if state != "LOOKING_FOR_SUBJECT_INFO" or subject_code:
+                                header_pending = True
+                            continue
+                        if state == "BETWEEN_COURSES":
+                            if after_course:
+                                rows_ignored += 1
+                            continue
+                        
+                        # Section headers (see section_rules.json). Rows the
+                        # current section consumed above never reach this point.
+                        transition = section_rules.match(state, cells)
+                        if transition is not None:
+                            # The end of the unit table closes the last unit
+                            if state == "PROCESSING_UNITS" and transition.target != state and current_unit:
+                                units.append(current_unit)
+                                current_unit = None
+                            state = transition.target
+                            if transition.resource:
+                                current_resource_type = transition.resource
+                            if state == "DONE":
+                                completed.append((subject_code, subject_info, units, course_outcomes, resources))
+                                state = "BETWEEN_COURSES"
+                                after_course = True
+                            continue
+                        
+                        # Extract resources
+                        if state == "LOOKING_FOR_RESOURCES":
+                            # Extract resource entries (numbered items)
+                            if col0 and (col0.isdigit() or col0.endswith('.')):
+                                resource_text = ""
+                                for cell_str in cells[1:]:
+                                    if len(cell_str) > 10:
+                                        resource_text = clean_text(cell_str)
+                                        break
+                                if resource_text and current_resource_type:
+                                    resources[current_resource_type].append(resource_text)
+                    
+                    if finished:
+                        break
+                timer.stop("state_machine", started, page_no)
+                # Topics are split outside the state machine's timing
+                for code, *collected in completed:
+                    yield code, syllabus_result(*collected, timer)
+                if finished:
+                    break
+            if not finished and state != "BETWEEN_COURSES" and (state != "LOOKING_FOR_SUBJECT_INFO" or subject_code):
+                # The document ended inside a course
+                yield subject_code, syllabus_result(subject_info, units, course_outcomes, resources, timer)
+    finally:
+        if stats is not None:
+            stats["pages"] = stats.get("pages", 0) + pages_scanned
+            stats["pages_skipped"] = stats.get("pages_skipped", 0) + pages_skipped
+            stats["rows_ignored"] = stats.get("rows_ignored", 0) + rows_ignored
+
+HANDBOOK_MIN_CHUNK_PAGES = 10
+
+def course_key(subject_code, ordinal):
+    """Output key for a handbook course: its subject code made key-safe, or course_<n>."""
+    key = re.sub(r'\W+', '_', subject_code or "").strip('_')
+    return key or f"course_{ordinal:03d}"
+
+def extract_page_range(page_range, pdf_path, backend=DEFAULT_BACKEND):
+    """
+    The (subject_code, syllabus) pairs of the courses starting in a (first,
+    last) page range, and the iter_courses stats of the range.
+    """
+    first_page, last_page = page_range
+    stats = {}
+    courses = list(iter_courses(pdf_path, stats, backend=backend, first_page=first_page, last_page=last_page))
+    return courses, stats
+
+def iter_handbook(pdf_path, workers=1, backend=DEFAULT_BACKEND, chunk_pages=None, timeout=None,
+                  stats=None):
+    """
+    Yield (key, syllabus dict) for every course in a multi-course handbook,
+    in page order. Keys are subject codes (see course_key); a repeated code
+    gets a _2, _3, ... suffix.
+
+    With one worker, courses stream out of iter_courses as they complete.
+    With more, the pages are cut into ranges of chunk_pages (default: two
+    ranges per worker, at least HANDBOOK_MIN_CHUNK_PAGES) that SupervisedPool
+    workers extract in parallel. iter_courses reads each course in exactly
+    one range, so the result is the same as a serial scan. A range that
+    fails, or takes longer than timeout seconds, raises RuntimeError.
+    stats, if given, gets the summed iter_courses counts.
+    """
+    if stats is None:
+        stats = {}
+    if workers <= 1:
+        courses = iter_courses(pdf_path, stats, backend=backend)
+    else:
+        if not is_path(pdf_path) and not isinstance(pdf_path, (bytes, bytearray, memoryview, mmap.mmap)):
+            # Forked workers would share the file's position; give them its bytes
+            pdf_path = pdf_path.read()
+        with pdfplumber.open(open_source(pdf_path)) as pdf:
+            page_count = len(pdf.pages)
+        if not chunk_pages:
+            chunk_pages = max(HANDBOOK_MIN_CHUNK_PAGES, -(-page_count // (workers * 2)))
+        ranges = [(first, min(first + chunk_pages - 1, page_count))
+                  for first in range(1, page_count + 1, chunk_pages)]
+        pool = SupervisedPool(partial(extract_page_range, pdf_path=pdf_path, backend=backend),
+                              min(workers, len(ranges)), timeout=timeout, max_files=None)
+        courses = _chain_ranges(pool.map(ranges), ranges, pdf_path, stats)
+    seen = {}
+    try:
+        for ordinal, (subject_code, syllabus_data) in enumerate(courses, 1):
+            key = course_key(subject_code, ordinal)
+            seen[key] = seen.get(key, 0) + 1
+            if seen[key] > 1:
+                key = f"{key}_{seen[key]}"
+            yield key, syllabus_data
+    finally:
+        courses.close()
+
+def _chain_ranges(results, ranges, pdf_path, stats):
+    """
+    Flatten SupervisedPool.map results of extract_page_range, failing on a
+    stopped range and summing page and row counts into stats.
+
+    A range that starts inside a course can open a partial copy of it at a
+    repeated code row. The range before read that course to its end, and a
+    serial scan never opens a course with the code of the one before, so a
+    leading course with the previous range's last code is dropped.
+    """
+    last_code = None
+    try:
+        for (result, failure), (first_page, last_page) in zip(results, ranges):
+            if failure is not None:
+                reason, detail = failure
+                raise RuntimeError(f"Pages {first_page}-{last_page} of {pdf_path} failed ({reason}): {detail}")
+            found, range_stats = result
+            for key in ("pages", "pages_skipped", "rows_ignored"):
+                stats[key] = stats.get(key, 0) + range_stats.get(key, 0)
+            courses = found
+            if found and last_code is not None and found[0][0] == last_code:
+                courses = found[1:]
+            if found:
+                # A range without a course lies inside the one still open
+                last_code = found[-1][0]
+            yield from courses
+    finally:
+        # Stops the workers if the caller stopped early
+        results.close()
+
 def sanitize_filename(filename):
     """Remove file extension and clean up filename for use as a key."""
     name = os.path.splitext(filename)[0]
@@ -297,158 +586,631 @@ def generate_json_for_pdf(syllabus_data, pdf_name):
     }
     return data
 
-def generate_pdf(syllabus_data, pdf_name, output_path):
-    """Generate PDF summary for a single syllabus."""
-    doc = SimpleDocTemplate(output_path, pagesize=letter)
-    styles = getSampleStyleSheet()
-    story = []
-
-    # Title - use the PDF name
-    title_style = styles['Heading1']
-    title_style.alignment = 1 # Center
-    clean_name = sanitize_filename(pdf_name).replace('_', ' ')
-    story.append(Paragraph(f"{clean_name} Summary", title_style))
-    story.append(Spacer(1, 12))
-    
-    # Subject Info
-    if syllabus_data.get("subject_info"):
-        info = syllabus_data["subject_info"]
-        if info:
-            story.append(Paragraph("Subject Information", styles['Heading2']))
-            info_text = []
-            if "credits" in info:
-                info_text.append(f"Credits: {info['credits']}")
-            if "total_marks" in info:
-                info_text.append(f"Total Marks: {info['total_marks']}")
-            if "cia_marks" in info:
-                info_text.append(f"CIA: {info['cia_marks']}")
-            if "external_marks" in info:
-                info_text.append(f"External: {info['external_marks']}")
-            if info_text:
-                story.append(Paragraph(" | ".join(info_text), styles['Normal']))
-                story.append(Spacer(1, 12))
-    
-    # Units
-    units = syllabus_data.get("units", [])
-    if units:
-        story.append(Paragraph("Course Units", styles['Heading2']))
-        story.append(Spacer(1, 6))
+class SummaryRenderer:
+    """
+    Renders syllabus summaries with styles and a page template built once.
 
-    for unit in units:
-        # Unit Header
-        unit_header = f"Unit {unit['Unit_Number']}: {unit['Unit_Name']}"
-        story.append(Paragraph(unit_header, styles['Heading2']))
-        
-        # Topics
-        bullet_style = ParagraphStyle(
+    getSampleStyleSheet(), the centred title style, the bullet style and the
+    letter-size page template are created in __init__ and reused for every
+    summary, so per-summary cost is just the story and the reportlab layout.
+    Not thread-safe: use one renderer per thread or process.
+
+    reportlab is imported here rather than at module level, so extraction-only
+    callers (--extract, --no-summaries, the server's /extract) never load it.
+    """
+
+    def __init__(self, pagesize=None):
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame
+
+        styles = getSampleStyleSheet()
+        self.title_style = ParagraphStyle('SummaryTitle', parent=styles['Heading1'], alignment=1)
+        self.heading_style = styles['Heading2']
+        self.normal_style = styles['Normal']
+        self.bullet_style = ParagraphStyle(
             'Bullet',
             parent=styles['Normal'],
             bulletIndent=10,
             leftIndent=20,
             spaceAfter=5
         )
+        # Same geometry as SimpleDocTemplate: 1 inch margins, a single frame
+        self.doc = BaseDocTemplate(None, pagesize=pagesize or letter)
+        frame = Frame(self.doc.leftMargin, self.doc.bottomMargin,
+                      self.doc.width, self.doc.height, id='normal')
+        self.doc.addPageTemplates([PageTemplate(id='Summary', frames=[frame])])
+
+    def build_story(self, syllabus_data, pdf_name):
+        """Return the list of flowables for one syllabus summary."""
+        from reportlab.platypus import Paragraph, Spacer
+
+        story = []
+
+        # Title - use the PDF name
+        clean_name = sanitize_filename(pdf_name).replace('_', ' ')
+        story.append(Paragraph(f"{clean_name} Summary", self.title_style))
+        story.append(Spacer(1, 12))
         
-        for topic in unit['Topics']:
-            story.append(Paragraph(f"• {topic}", bullet_style))
+        # Subject Info
+        if syllabus_data.get("subject_info"):
+            info = syllabus_data["subject_info"]
+            if info:
+                story.append(Paragraph("Subject Information", self.heading_style))
+                info_text = []
+                if "credits" in info:
+                    info_text.append(f"Credits: {info['credits']}")
+                if "total_marks" in info:
+                    info_text.append(f"Total Marks: {info['total_marks']}")
+                if "cia_marks" in info:
+                    info_text.append(f"CIA: {info['cia_marks']}")
+                if "external_marks" in info:
+                    info_text.append(f"External: {info['external_marks']}")
+                if info_text:
+                    story.append(Paragraph(" | ".join(info_text), self.normal_style))
+                    story.append(Spacer(1, 12))
         
-        story.append(Spacer(1, 12))
-    
-    # Course Outcomes
-    outcomes = syllabus_data.get("course_outcomes", {})
-    if outcomes:
-        story.append(Paragraph("Course Outcomes", styles['Heading2']))
-        for co_num in sorted(outcomes.keys()):
-            story.append(Paragraph(f"<b>CO{co_num}:</b> {outcomes[co_num]}", styles['Normal']))
+        # Units
+        units = syllabus_data.get("units", [])
+        if units:
+            story.append(Paragraph("Course Units", self.heading_style))
             story.append(Spacer(1, 6))
-        story.append(Spacer(1, 12))
-    
-    # Resources
-    resources = syllabus_data.get("resources", {})
-    
-    if resources.get("text_books"):
-        story.append(Paragraph("Text Books", styles['Heading2']))
-        for i, book in enumerate(resources["text_books"], 1):
-            story.append(Paragraph(f"{i}. {book}", styles['Normal']))
-            story.append(Spacer(1, 3))
-        story.append(Spacer(1, 12))
-    
-    if resources.get("reference_books"):
-        story.append(Paragraph("Reference Books", styles['Heading2']))
-        for i, book in enumerate(resources["reference_books"], 1):
-            story.append(Paragraph(f"{i}. {book}", styles['Normal']))
-            story.append(Spacer(1, 3))
-        story.append(Spacer(1, 12))
+
+        for unit in units:
+            # Unit Header
+            unit_header = f"Unit {unit['Unit_Number']}: {unit['Unit_Name']}"
+            story.append(Paragraph(unit_header, self.heading_style))
+            
+            # Topics
+            for topic in unit['Topics']:
+                story.append(Paragraph(f"• {topic}", self.bullet_style))
+            
+            story.append(Spacer(1, 12))
+        
+        # Course Outcomes
+        outcomes = syllabus_data.get("course_outcomes", {})
+        if outcomes:
+            story.append(Paragraph("Course Outcomes", self.heading_style))
+            for co_num in sorted(outcomes.keys()):
+                story.append(Paragraph(f"<b>CO{co_num}:</b> {outcomes[co_num]}", self.normal_style))
+                story.append(Spacer(1, 6))
+            story.append(Spacer(1, 12))
+        
+        # Resources
+        resources = syllabus_data.get("resources", {})
+        
+        if resources.get("text_books"):
+            story.append(Paragraph("Text Books", self.heading_style))
+            for i, book in enumerate(resources["text_books"], 1):
+                story.append(Paragraph(f"{i}. {book}", self.normal_style))
+                story.append(Spacer(1, 3))
+            story.append(Spacer(1, 12))
+        
+        if resources.get("reference_books"):
+            story.append(Paragraph("Reference Books", self.heading_style))
+            for i, book in enumerate(resources["reference_books"], 1):
+                story.append(Paragraph(f"{i}. {book}", self.normal_style))
+                story.append(Spacer(1, 3))
+            story.append(Spacer(1, 12))
+        
+        if resources.get("web_resources"):
+            story.append(Paragraph("Web Resources", self.heading_style))
+            for i, resource in enumerate(resources["web_resources"], 1):
+                story.append(Paragraph(f"{i}. {resource}", self.normal_style))
+                story.append(Spacer(1, 3))
+
+        return story
+
+    def render(self, syllabus_data, pdf_name, output_path):
+        """Write the summary PDF for one syllabus to a path or binary file object."""
+        self.doc.build(self.build_story(syllabus_data, pdf_name), filename=output_path)
+
+    def render_many(self, items, output_dir):
+        """
+        Render (syllabus_data, pdf_name) pairs to {name}_summary.pdf files in
+        output_dir. Returns the list of written paths.
+        """
+        paths = []
+        for syllabus_data, pdf_name in items:
+            name = os.path.splitext(os.path.basename(pdf_name))[0]
+            output_path = os.path.join(output_dir, f"{name}_summary.pdf")
+            self.render(syllabus_data, pdf_name, output_path)
+            paths.append(output_path)
+        return paths
+
+    def render_catalogue(self, items, output_path):
+        """Render (syllabus_data, pdf_name) pairs into one PDF, one summary per section."""
+        from reportlab.platypus import PageBreak
+
+        story = []
+        for syllabus_data, pdf_name in items:
+            if story:
+                story.append(PageBreak())
+            story.extend(self.build_story(syllabus_data, pdf_name))
+        self.doc.build(story, filename=output_path)
+
+_default_renderer = None
+
+def get_renderer():
+    """Return this process's shared SummaryRenderer, creating it on first use."""
+    global _default_renderer
+    if _default_renderer is None:
+        _default_renderer = SummaryRenderer()
+    return _default_renderer
+
+def generate_pdf(syllabus_data, pdf_name, output_path):
+    """Generate PDF summary for a single syllabus."""
+    get_renderer().render(syllabus_data, pdf_name, output_path)
+
+def summary_is_current(pdf_path, pdf_out_path):
+    """True if the summary PDF exists and is not older than its source PDF."""
+    if not is_path(pdf_path):
+        # In-memory PDFs have no modification time to compare with
+        return False
+    try:
+        return os.path.getmtime(pdf_out_path) >= os.path.getmtime(pdf_path)
+    except OSError:
+        return False
+
+def append_jsonl(f, pdf_json):
+    """Write one generate_json_for_pdf record as a compact JSON line and flush it."""
+    f.write(json.dumps(pdf_json, separators=(',', ':')))
+    f.write('\n')
+    f.flush()
+
+def compact_jsonl(jsonl_path, json_path):
+    """
+    Assemble the legacy nested master JSON from a JSON Lines file.
+
+    The output is byte-identical to json.dump(master_json, f, indent=2) over
+    the same records merged with dict.update(): keys keep their first position
+    and a repeated key takes its last value. Only a key -> line offset index is
+    held in memory; each record is loaded, written and dropped in turn.
+    Returns the number of entries written.
+    """
+    decoder = json.JSONDecoder()
+    offsets = {}
+    with open(jsonl_path, 'rb') as f:
+        offset = 0
+        for line in f:
+            text = line.decode('utf-8')
+            if text.strip():
+                # Records are single-key objects: decode just the key after '{'
+                key, _ = decoder.raw_decode(text, 1)
+                offsets[key] = offset
+            offset += len(line)
     
-    if resources.get("web_resources"):
-        story.append(Paragraph("Web Resources", styles['Heading2']))
-        for i, resource in enumerate(resources["web_resources"], 1):
-            story.append(Paragraph(f"{i}. {resource}", styles['Normal']))
-            story.append(Spacer(1, 3))
+    with open(jsonl_path, 'rb') as src, open(json_path, 'w', encoding='utf-8') as out:
+        if not offsets:
+            out.write('{}')
+            return 0
+        out.write('{')
+        for i, (key, offset) in enumerate(offsets.items()):
+            src.seek(offset)
+            record = json.loads(src.readline().decode('utf-8'))
+            value = json.dumps(record[key], indent=2).replace('\n', '\n  ')
+            out.write(',\n  ' if i else '\n  ')
+            out.write(f"{json.dumps(key)}: {value}")
+        out.write('\n}')
+    return len(offsets)
 
-    doc.build(story)
+# How every PDF of a batch is handled (see the README for each option)
+FileOptions = namedtuple("FileOptions",
+                         ["cache", "timings", "summaries", "backend", "precheck_pages", "precheck_markers"],
+                         defaults=(None, False, True, DEFAULT_BACKEND, PRECHECK_PAGES, False))
 
-def process_pdf_folder(input_folder, output_dir):
-    """Process all PDFs in a folder."""
+def process_single_pdf(pdf_path, output_dir, options=FileOptions(), profile_dir=None, pdf_name=None,
+                       supervised=False):
+    """
+    Extract and render one PDF; returns (pdf_json or None, report lines, stats).
+    Kept at module level so it can be shipped to worker processes.
+    pdf_name names a PDF that is not given by path. With supervised, a
+    MemoryError is left for SupervisedPool to report.
+    """
+    pdf_file = pdf_name or os.path.basename(pdf_path)
+    if hasattr(pdf_path, "read"):
+        # Hashed for the cache and then extracted, so a stream is buffered once
+        pdf_path = open_source(pdf_path)
+    messages = []
+    pdf_json = None
+    stats = {}
+    cache = options.cache
+    timer = StageTimer() if options.timings or profile_dir else NULL_TIMER
+    profiler = None
+    if profile_dir:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    file_started = timer.start()
+    try:
+        syllabus_data = None
+        if cache is not None:
+            with timer.stage("cache_lookup"):
+                digest = cache.digest(pdf_path)
+                syllabus_data = cache.get(digest)
+        cache_hit = syllabus_data is not None
+        if not cache_hit:
+            syllabus_data = extract_syllabus(pdf_path, stats, timer=timer, backend=options.backend,
+                                             precheck_pages=options.precheck_pages,
+                                             precheck_markers=options.precheck_markers)
+            if stats.get("pages_skipped"):
+                messages.append(f"  Skipped {stats['pages_skipped']} of {stats['pages']} page(s) without tables")
+            if cache is not None:
+                cache.put(digest, syllabus_data)
+        
+        if syllabus_data and syllabus_data.get("units"):
+            # Generate individual PDF summary
+            pdf_name = os.path.splitext(pdf_file)[0]
+            pdf_out_path = os.path.join(output_dir, f"{pdf_name}_summary.pdf")
+            
+            if not options.summaries:
+                pass
+            elif cache_hit and summary_is_current(pdf_path, pdf_out_path):
+                messages.append(f"  Cached, summary up to date: {pdf_out_path}")
+            else:
+                messages.append(f"  Generating PDF: {pdf_out_path}")
+                with timer.stage("generate_pdf"):
+                    generate_pdf(syllabus_data, pdf_file, pdf_out_path)
+            
+            pdf_json = generate_json_for_pdf(syllabus_data, pdf_file)
+            messages.append(f"  ✓ Successfully processed {pdf_file}")
+        else:
+            messages.append(f"  ✗ No syllabus units found in {pdf_file}")
+    except NotASyllabus as e:
+        stats["rejected"] = {"reason": e.reason, "detail": e.detail}
+        messages.append(f"  ✗ Not a syllabus ({e.reason}): {e.detail}")
+    except MemoryError:
+        if supervised:
+            # Over the worker's memory budget; SupervisedPool reports it
+            raise
+        messages.append(f"  ✗ Error processing {pdf_file}: out of memory")
+    except Exception as e:
+        # pdfplumber wraps errors from pdfminer, including MemoryError
+        if supervised and isinstance(e.__cause__ or e.__context__, MemoryError):
+            raise MemoryError from e
+        messages.append(f"  ✗ Error processing {pdf_file}: {e}")
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(profile_dir, f"{pdf_file}.pstats"))
+    if timer.enabled:
+        stats["timings"] = {"seconds": time.perf_counter() - file_started, **timer.to_dict()}
+    return pdf_json, messages, stats
+
+def process_pdf_source(item, **options):
+    """process_single_pdf for a (file name, PDF source) batch item."""
+    pdf_name, source = item
+    return process_single_pdf(source, pdf_name=pdf_name, **options)
+
+def archive_sources(archive_path, member_names):
+    """
+    (file name, bytes) items for the PDFs in a zip or tar archive, read one
+    at a time. Each member path is appended to member_names as it is read,
+    and its file name is the member path with "/" turned into "_", so
+    results are named after where the PDF sits in the archive.
+    """
+    for member, data in iter_archive_pdfs(archive_path):
+        member_names.append(member)
+        yield member.replace("/", "_"), data
+
+def process_pdf_folder(input_folder, output_dir, workers=None, options=FileOptions(), stream_jsonl=False,
+                       profile=False, file_timeout=DEFAULT_TIMEOUT, max_memory_mb=None,
+                       max_files_per_worker=DEFAULT_MAX_FILES, index=None, dedup_resources=False):
+    """
+    Process all PDFs in a folder, or in a zip or tar archive, with workers
+    processes (default: CPU count) and FileOptions for each PDF. The master
+    JSON and the report keep the folder order. The README describes the
+    per-file budgets, stream_jsonl, profile, index and dedup_resources.
+    """
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
-    # Find all PDF files
-    pdf_files = [f for f in os.listdir(input_folder) if f.lower().endswith('.pdf')]
-    
-    if not pdf_files:
-        print(f"No PDF files found in {input_folder}")
-        return
+    if workers is None:
+        workers = os.cpu_count() or 1
     
-    print(f"Found {len(pdf_files)} PDF file(s)")
+    if is_archive(input_folder):
+        print(f"Reading PDFs from archive {input_folder}")
+        # Filled in as members are read, always ahead of their results
+        pdf_files = []
+        sources = archive_sources(input_folder, pdf_files)
+    else:
+        # Find all PDF files
+        pdf_files = [f for f in os.listdir(input_folder) if f.lower().endswith('.pdf')]
+        
+        if not pdf_files:
+            print(f"No PDF files found in {input_folder}")
+            return
+        
+        print(f"Found {len(pdf_files)} PDF file(s)")
+        workers = max(1, min(workers, len(pdf_files)))
+        sources = [(f, os.path.join(input_folder, f)) for f in pdf_files]
     
     # Master JSON to combine all PDFs
     master_json = {}
+    jsonl_file = None
+    jsonl_path = os.path.join(output_dir, "master_syllabus.jsonl")
+    if stream_jsonl:
+        jsonl_file = open(jsonl_path, 'w', encoding='utf-8')
+        processed_keys = set()
     
-    for pdf_file in pdf_files:
-        pdf_path = os.path.join(input_folder, pdf_file)
-        print(f"\nProcessing: {pdf_file}")
-        
-        try:
-            syllabus_data = extract_syllabus(pdf_path)
-            
-            if syllabus_data and syllabus_data.get("units"):
-                # Generate individual PDF summary
-                pdf_name = os.path.splitext(pdf_file)[0]
-                pdf_out_path = os.path.join(output_dir, f"{pdf_name}_summary.pdf")
-                
-                print(f"  Generating PDF: {pdf_out_path}")
-                generate_pdf(syllabus_data, pdf_file, pdf_out_path)
-                
-                # Add to master JSON
-                pdf_json = generate_json_for_pdf(syllabus_data, pdf_file)
-                master_json.update(pdf_json)
-                
-                print(f"  ✓ Successfully processed {pdf_file}")
-            else:
-                print(f"  ✗ No syllabus units found in {pdf_file}")
-        except Exception as e:
-            print(f"  ✗ Error processing {pdf_file}: {e}")
+    if profile:
+        options = options._replace(timings=True)
+    cache = options.cache
+    timings = options.timings
+    profile_dir = tempfile.mkdtemp(prefix="profile_", dir=output_dir) if profile else None
+    run_timer = StageTimer() if timings else NULL_TIMER
+    file_timings = {}
+    process_one = partial(process_pdf_source, output_dir=output_dir, options=options,
+                          profile_dir=profile_dir)
+    
+    pool = None
+    if workers == 1 and not file_timeout and not max_memory_mb:
+        results = map(process_one, sources)
+    else:
+        if workers > 1:
+            print(f"Using {workers} worker processes")
+        pool = SupervisedPool(partial(process_one, supervised=True), workers, timeout=file_timeout,
+                              max_memory_mb=max_memory_mb, max_files=max_files_per_worker)
+        # map() yields in input order as soon as each leading result is ready
+        results = pool.map(sources)
+    
+    total_pages = 0
+    total_skipped = 0
+    failures = []
+    rejected = []
+    
+    try:
+        for i, result in enumerate(results):
+            pdf_file = pdf_files[i]
+            if pool is not None:
+                result, failure = result
+                if failure is not None:
+                    reason, detail = failure
+                    failures.append({"file": pdf_file, "reason": reason, "detail": detail})
+                    result = (None, [f"  ✗ Stopped {pdf_file} ({reason}): {detail}"], {})
+            pdf_json, messages, stats = result
+            if "rejected" in stats:
+                rejected.append({"file": pdf_file, **stats["rejected"]})
+            total_pages += stats.get("pages", 0)
+            total_skipped += stats.get("pages_skipped", 0)
+            if "timings" in stats:
+                file_timings[pdf_file] = stats["timings"]
+            print(f"\nProcessing: {pdf_file}")
+            for message in messages:
+                print(message)
+            if pdf_json:
+                if index is not None:
+                    index.upsert_pdf_json(pdf_json)
+                if jsonl_file is not None:
+                    append_jsonl(jsonl_file, pdf_json)
+                    processed_keys.update(pdf_json)
+                else:
+                    # Add to master JSON
+                    master_json.update(pdf_json)
+    finally:
+        if pool is not None:
+            # Stops the workers if the loop ended early
+            results.close()
+        if jsonl_file is not None:
+            jsonl_file.close()
+    
+    failures_path = os.path.join(output_dir, "failures.json")
+    if failures:
+        with open(failures_path, 'w', encoding='utf-8') as f:
+            json.dump(failures, f, indent=2)
+    elif os.path.exists(failures_path):
+        os.remove(failures_path)
+    rejected_path = os.path.join(output_dir, "rejected.json")
+    if rejected:
+        with open(rejected_path, 'w', encoding='utf-8') as f:
+            json.dump(rejected, f, indent=2)
+    elif os.path.exists(rejected_path):
+        os.remove(rejected_path)
+    
+    if cache is not None:
+        evicted = cache.evict()
+        if evicted:
+            print(f"\nEvicted {evicted} old cache entr{'y' if evicted == 1 else 'ies'}")
     
     # Write master JSON
     master_json_path = os.path.join(output_dir, "master_syllabus.json")
     print(f"\nGenerating master JSON: {master_json_path}")
-    with open(master_json_path, 'w', encoding='utf-8') as f:
-        json.dump(master_json, f, indent=2)
+    with run_timer.stage("write_master_json"):
+        if jsonl_file is not None:
+            compact_jsonl(jsonl_path, master_json_path)
+            processed = len(processed_keys)
+        else:
+            with open(master_json_path, 'w', encoding='utf-8') as f:
+                json.dump(master_json, f, indent=2)
+            processed = len(master_json)
+    
+    if dedup_resources:
+        # pandas is only needed for this stage
+        from resource_dedup import deduplicate_files
+        with run_timer.stage("dedup_resources"):
+            canonical, references, canonical_path, _ = deduplicate_files([master_json_path], output_dir)
+        print(f"Resources: {len(references)} citations -> {len(canonical)} canonical entries in {canonical_path}")
+    
+    if timings:
+        report = build_report(file_timings, run_timer)
+        report_path = os.path.join(output_dir, "timing_report.json")
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print("\n" + format_report(report))
+        print(f"Timing report: {report_path}")
+    if profile_dir:
+        parts = [os.path.join(profile_dir, name) for name in os.listdir(profile_dir)]
+        if parts:
+            profile_path = os.path.join(output_dir, "profile.pstats")
+            pstats.Stats(*parts).dump_stats(profile_path)
+            print(f"cProfile stats: {profile_path}")
+        shutil.rmtree(profile_dir)
     
     print("\n" + "="*60)
     print(f"Processing complete!")
-    print(f"Processed {len(master_json)} PDF(s)")
+    print(f"Processed {processed} PDF(s)")
+    if failures:
+        print(f"Stopped {len(failures)} PDF(s) over budget, see {failures_path}")
+    if rejected:
+        print(f"Rejected {len(rejected)} PDF(s) that are not syllabi, see {rejected_path}")
+    if pool is not None and pool.recycled:
+        print(f"Worker processes recycled: {pool.recycled}")
+    if total_pages:
+        print(f"Pages scanned: {total_pages}, skipped by table pre-scan: {total_skipped}")
+    peak_mb = peak_memory_mb()
+    if peak_mb is not None:
+        print(f"Peak memory (largest process): {peak_mb:.1f} MB")
     print(f"Output directory: {output_dir}")
     print("="*60)
 
+def process_handbook(pdf_path, output_dir, workers=None, summaries=True, backend=DEFAULT_BACKEND,
+                     timeout=DEFAULT_TIMEOUT, index=None):
+    """
+    Extract every course of one multi-course handbook PDF (see iter_handbook).
+
+    Each course is written as soon as it arrives: a <key>_summary.pdf unless
+    summaries=False, and an upsert into index if given. master_syllabus.json
+    then holds one entry per course, keyed by subject code. timeout, if set,
+    applies to each page range.
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    
+    print(f"Handbook: {pdf_path}")
+    if workers > 1:
+        print(f"Using {workers} worker processes")
+    started = time.perf_counter()
+    master_json = {}
+    stats = {}
+    for key, syllabus_data in iter_handbook(pdf_path, workers, backend=backend, timeout=timeout, stats=stats):
+        pdf_json = generate_json_for_pdf(syllabus_data, key)
+        master_json.update(pdf_json)
+        if index is not None:
+            index.upsert_pdf_json(pdf_json)
+        if summaries and syllabus_data.get("units"):
+            generate_pdf(syllabus_data, key, os.path.join(output_dir, f"{key}_summary.pdf"))
+        print(f"  ✓ {key}: {len(syllabus_data['units'])} unit(s)")
+    
+    master_json_path = os.path.join(output_dir, "master_syllabus.json")
+    with open(master_json_path, 'w', encoding='utf-8') as f:
+        json.dump(master_json, f, indent=2)
+    
+    print("\n" + "="*60)
+    print(f"Extracted {len(master_json)} course(s) in {time.perf_counter() - started:.1f}s")
+    if stats.get("rows_ignored"):
+        # Rows after a course's Methods of Evaluation that opened no course
+        print(f"Ignored {stats['rows_ignored']} row(s) between courses; if a course is missing, "
+              f"check course_start and subject_code in section_rules.json")
+    print(f"Master JSON: {master_json_path}")
+    print("="*60)
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract syllabus units and topics from PDF files.")
+    parser.add_argument("--input", default="input",
+                        help="folder, or zip/tar archive, of syllabus PDFs (default: input)")
+    parser.add_argument("--output", default="output", help="output directory (default: output)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for folder mode (default: CPU count)")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="stream results to master_syllabus.jsonl as each PDF finishes")
+    parser.add_argument("--compact", metavar="JSONL",
+                        help="rebuild master_syllabus.json in the output directory from a .jsonl file and exit")
+    parser.add_argument("--no-summaries", action="store_true",
+                        help="write only the JSON output, no summary PDFs (reportlab is not loaded)")
+    parser.add_argument("--handbook", metavar="PDF",
+                        help="extract every course of one multi-course handbook, keyed by subject code")
+    parser.add_argument("--extract", nargs="+", metavar="PDF",
+                        help="print the JSON for these PDFs to stdout and exit (no summary PDFs)")
+    parser.add_argument("--backend", choices=sorted(TABLE_BACKENDS), default=DEFAULT_BACKEND,
+                        help=f"table extraction engine (default: {DEFAULT_BACKEND}); "
+                             "'grid' is faster on fully ruled tables")
+    parser.add_argument("--file-timeout", type=float, default=DEFAULT_TIMEOUT,
+                        help="seconds one PDF may take before it is stopped (default: 0 = no limit)")
+    parser.add_argument("--max-memory-mb", type=int, default=None,
+                        help="memory one PDF may add to its worker before it is stopped (Linux only)")
+    parser.add_argument("--max-files-per-worker", type=int, default=DEFAULT_MAX_FILES,
+                        help=f"replace each worker process after this many PDFs (default: {DEFAULT_MAX_FILES}, 0 = never)")
+    parser.add_argument("--precheck-pages", type=int, default=PRECHECK_PAGES,
+                        help=f"reject PDFs whose leading pages, this many, have no text layer "
+                             f"(default: {PRECHECK_PAGES}, 0 = extract every PDF)")
+    parser.add_argument("--precheck-markers", action="store_true",
+                        help="also reject PDFs without a syllabus signature in those pages")
+    parser.add_argument("--index", metavar="DB",
+                        help="also upsert every extracted PDF into this full-text index (see syllabus_index.py)")
+    parser.add_argument("--resources", action="store_true",
+                        help="also write canonical resource tables with near-duplicate citations merged")
+    parser.add_argument("--timings", action="store_true",
+                        help="write per-stage, per-file and per-page timings to timing_report.json")
+    parser.add_argument("--profile", action="store_true",
+                        help="like --timings, and also dump cProfile stats to profile.pstats")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"extraction cache directory (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="evict least recently used cache entries above this size")
+    parser.add_argument("--no-cache", action="store_true", help="always re-parse every PDF")
+    parser.add_argument("--clear-cache", action="store_true", help="delete all cache entries and exit")
+    parser.add_argument("--invalidate", nargs="+", metavar="PDF",
+                        help="drop the cache entries for these PDFs and exit")
+    args = parser.parse_args()
+    if args.max_memory_mb and not memory_limits_supported():
+        parser.error("--max-memory-mb is only supported on Linux")
+    
+    if args.compact:
+        if not os.path.exists(args.output):
+            os.makedirs(args.output)
+        master_json_path = os.path.join(args.output, "master_syllabus.json")
+        count = compact_jsonl(args.compact, master_json_path)
+        print(f"Wrote {count} PDF(s) to {master_json_path}")
+        raise SystemExit(0)
+    
+    if args.handbook:
+        process_handbook(args.handbook, args.output, workers=args.workers, summaries=not args.no_summaries,
+                         backend=args.backend, timeout=args.file_timeout,
+                         index=SyllabusIndex(args.index) if args.index else None)
+        raise SystemExit(0)
+    
+    if args.extract:
+        # JSON-only path for one-off calls: no output folder, no reportlab
+        extracted = {}
+        for pdf in args.extract:
+            syllabus_data = extract_syllabus(pdf, backend=args.backend)
+            extracted.update(generate_json_for_pdf(syllabus_data, os.path.basename(pdf)))
+        json.dump(extracted, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        raise SystemExit(0)
+    
+    # Cached results depend on the rule files and the table backend
+    cache_salt = f"{get_unit_name_rules().digest}:{get_section_rules().digest}:{args.backend}"
+    cache = None
+    if not args.no_cache:
+        cache = ExtractionCache(args.cache_dir, args.cache_max_mb * 1024 * 1024, key_salt=cache_salt)
+    
+    if args.clear_cache or args.invalidate:
+        cache = cache or ExtractionCache(args.cache_dir, key_salt=cache_salt)
+        if args.clear_cache:
+            print(f"Removed {cache.clear()} cache entries from {args.cache_dir}")
+        for pdf in args.invalidate or []:
+            if cache.invalidate(pdf):
+                print(f"Invalidated {pdf}")
+            else:
+                print(f"No cache entry for {pdf}")
+        raise SystemExit(0)
+    
     # Check if input folder exists, otherwise use single file
-    input_folder = "input"
-    output_dir = "output"
+    input_folder = args.input
+    output_dir = args.output
     
-    if os.path.exists(input_folder) and os.path.isdir(input_folder):
+    if os.path.isdir(input_folder) or is_archive(input_folder):
         print("Processing folder mode...")
-        process_pdf_folder(input_folder, output_dir)
+        options = FileOptions(cache=cache, timings=args.timings, summaries=not args.no_summaries,
+                              backend=args.backend, precheck_pages=args.precheck_pages,
+                              precheck_markers=args.precheck_markers)
+        process_pdf_folder(input_folder, output_dir, workers=args.workers, options=options,
+                           stream_jsonl=args.jsonl, profile=args.profile,
+                           file_timeout=args.file_timeout, max_memory_mb=args.max_memory_mb,
+                           max_files_per_worker=args.max_files_per_worker,
+                           index=SyllabusIndex(args.index) if args.index else None,
+                           dedup_resources=args.resources)
     else:
         # Fallback to single file mode
         print("Processing single file mode...")
@@ -459,7 +1221,7 @@ if __name__ == "__main__":
             print(f"Please create an 'input' folder with PDF files or ensure '{pdf_file}' exists.")
         else:
             print(f"Extracting syllabus from {pdf_file}...")
-            syllabus_data = extract_syllabus(pdf_file)
+            syllabus_data = extract_syllabus(pdf_file, backend=args.backend)
             
             if syllabus_data and syllabus_data.get("units"):
                 if not os.path.exists(output_dir):
@@ -474,8 +1236,9 @@ if __name__ == "__main__":
                 with open(json_path, 'w', encoding='utf-8') as f:
                     json.dump(json_data, f, indent=2)
                 
-                print(f"Generating PDF: {pdf_out_path}")
-                generate_pdf(syllabus_data, pdf_file, pdf_out_path)
+                if not args.no_summaries:
+                    print(f"Generating PDF: {pdf_out_path}")
+                    generate_pdf(syllabus_data, pdf_file, pdf_out_path)
                 
                 print("Done!")
             else:
@@ -0,0 +1,230 @@
+"""
+Corpus-wide resource deduplication.
+
+Collects every text book, reference book and web resource from extracted
+syllabi, normalizes the citations and clusters near-duplicates (different
+spellings, punctuation, editions) into canonical resources:
+
+    python resource_dedup.py output/master_syllabus.json [--out output] [--threshold 0.7]
+
+writes resources_canonical.csv (one row per canonical resource) and
+resource_references.csv (one row per course citation, with its resource_id).
+
+Books (text and reference lists together) are clustered by MinHash over
+character 3-grams with LSH banding, all in numpy, so the cost grows with the
+number of distinct citations, not with its square. Web resources are merged
+only when their normalized URLs are equal.
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from syllabus_index import RESOURCE_KINDS, read_records
+
+DEFAULT_THRESHOLD = 0.7
+NUM_PERM = 64
+BANDS = 16
+
+_PRIME = (1 << 31) - 1
+_STOPWORDS = r"\b(?:and|of|the|a|an|in|for|to|with|by|on)\b"
+_EDITION = r"\b(\d+)\s*(?:st|nd|rd|th)?\s*(?:ed|edn|edition)\b\.?|\b(?:ed|edn|edition)\s*(\d+)\b"
+
+
+def citations_frame(records):
+    """One row per cited resource: course, kind and the citation as extracted."""
+    rows = []
+    for pdf_json in records:
+        for course, wrapped in pdf_json.items():
+            resources = wrapped[f"{course}_Syllabus"].get("resources", {})
+            for resource_type, kind in RESOURCE_KINDS.items():
+                for citation in resources.get(resource_type, []):
+                    rows.append((course, kind, citation))
+    return pd.DataFrame(rows, columns=["course", "kind", "citation"])
+
+
+def normalize_citations(frame):
+    """
+    Add the columns clustering works on:
+    - group: "web" for web resources, "book" otherwise
+    - edition: the edition number cited, if any
+    - key: the normalized citation. For books it is lowercase ASCII words
+      without punctuation, stopwords or the edition. For URLs it has no
+      scheme, "www.", whitespace (PDF text often splits URLs) or trailing
+      slash.
+    The string work runs once per distinct citation.
+    """
+    is_web = frame["kind"].eq("web_resource")
+    frame["group"] = np.where(is_web, "web", "book")
+    codes, uniques = pd.factorize(frame["citation"].astype(str))
+    text = pd.Series(uniques).str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii").str.lower()
+
+    edition = text.str.extract(_EDITION)
+    edition = edition[0].fillna(edition[1])
+    book_key = (text.str.replace(_EDITION, " ", regex=True)
+                .str.replace(r"[^a-z0-9]+", " ", regex=True)
+                .str.replace(_STOPWORDS, " ", regex=True)
+                .str.split().str.join(" "))
+    web_key = (text.str.replace(r"\s+", "", regex=True)
+               .str.replace(r"^[a-z]+://", "", regex=True)
+               .str.replace(r"^www\.", "", regex=True)
+               .str.rstrip("/"))
+    frame["edition"] = edition.to_numpy()[codes]
+    frame.loc[is_web, "edition"] = None
+    frame["key"] = np.where(is_web, web_key.to_numpy()[codes], book_key.to_numpy()[codes])
+    return frame
+
+
+def minhash_signatures(keys, num_perm=NUM_PERM, seed=1):
+    """
+    MinHash signatures (num_perm x len(keys)) over character 3-grams of each
+    key with spaces removed, computed for all keys at once.
+    """
+    encoded = [(" " + key.replace(" ", "") + " ").encode("utf-8") for key in keys]
+    lengths = np.fromiter((len(b) for b in encoded), dtype=np.int64, count=len(encoded))
+    buf = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+
+    # Every 3-gram that lies entirely within one padded key
+    grams_per_key = lengths - 2
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    first_gram = np.concatenate(([0], np.cumsum(grams_per_key)[:-1]))
+    positions = np.repeat(starts - first_gram, grams_per_key) + np.arange(grams_per_key.sum())
+    grams = (buf[positions] << np.uint64(16)) | (buf[positions + 1] << np.uint64(8)) | buf[positions + 2]
+
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+    signatures = np.empty((num_perm, len(keys)), dtype=np.uint64)
+    for i in range(num_perm):
+        signatures[i] = np.minimum.reduceat((a[i] * grams + b[i]) % np.uint64(_PRIME), first_gram)
+    return signatures
+
+
+def lsh_clusters(signatures, threshold=DEFAULT_THRESHOLD, bands=BANDS):
+    """
+    Cluster labels for the signature columns.
+
+    Keys that share all rows of some band are candidates. Each candidate is
+    compared with the first key of its bucket, and linked when their
+    signatures agree on at least threshold of the positions, which estimates
+    the 3-gram Jaccard similarity. Linked keys are merged into connected
+    components. Each band takes one sort, so the whole pass stays close to
+    linear in the number of keys.
+    """
+    num_perm, n = signatures.shape
+    rows = num_perm // bands
+    sources = []
+    targets = []
+    for band in range(bands):
+        block = signatures[band * rows:(band + 1) * rows]
+        band_keys = np.zeros(n, dtype=np.uint64)
+        for row in block:
+            band_keys = band_keys * np.uint64(1000003) ^ row
+        order = np.argsort(band_keys, kind="stable")
+        sorted_keys = band_keys[order]
+        new_bucket = np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+        bucket_first = order[np.maximum.accumulate(np.where(new_bucket, np.arange(n), 0))]
+        members = order[~new_bucket]
+        reps = bucket_first[~new_bucket]
+        if not len(members):
+            continue
+        agreement = (signatures[:, members] == signatures[:, reps]).mean(axis=0)
+        keep = agreement >= threshold
+        sources.append(members[keep])
+        targets.append(reps[keep])
+
+    labels = np.arange(n)
+    if sources:
+        u = np.concatenate(sources)
+        v = np.concatenate(targets)
+        # Min-label propagation with pointer jumping until every edge agrees
+        while True:
+            low = np.minimum(labels[u], labels[v])
+            before = labels.copy()
+            np.minimum.at(labels, u, low)
+            np.minimum.at(labels, v, low)
+            labels = labels[labels]
+            if np.array_equal(labels, before):
+                break
+    return labels
+
+
+def deduplicate(frame, threshold=DEFAULT_THRESHOLD):
+    """
+    Cluster the citations in a citations_frame.
+
+    Returns (canonical, references). canonical has one row per resource:
+    resource_id, group, the canonical citation (the spelling cited most
+    often, first cited on a tie), editions seen, and counts of variants, citations and courses.
+    references is the input with resource_id, edition and key added.
+    """
+    frame = normalize_citations(frame.copy())
+    frame = frame[frame["key"].str.len() > 0].reset_index(drop=True)
+    frame["cluster"] = ""
+
+    for group, part in frame.groupby("group", sort=False):
+        # Exact duplicates collapse first; only distinct keys are hashed
+        codes, keys = pd.factorize(part["key"])
+        if group == "web":
+            # URLs that differ in any character (an ID, a path) are different
+            # pages, so only the normalization above merges them
+            labels = np.arange(len(keys))
+        else:
+            labels = lsh_clusters(minhash_signatures(list(keys)), threshold)
+        frame.loc[part.index, "cluster"] = f"{group}:" + pd.Series(labels[codes], index=part.index).astype(str)
+
+    # Number resources by size, largest first, so ids are stable for a corpus
+    sizes = frame.groupby("cluster")["course"].transform("size")
+    order = frame.assign(size=sizes).sort_values(["size", "cluster"], ascending=[False, True])
+    ids = {cluster: i + 1 for i, cluster in enumerate(order["cluster"].drop_duplicates())}
+    frame["resource_id"] = frame["cluster"].map(ids)
+    frame = frame.drop(columns="cluster")
+
+    # Most cited spelling; ties go to the one cited first
+    spellings = (frame.groupby(["resource_id", "citation"], sort=False).size().rename("n").reset_index()
+                 .sort_values(["resource_id", "n"], ascending=[True, False], kind="stable")
+                 .drop_duplicates("resource_id").set_index("resource_id")["citation"])
+    editions = (frame[["resource_id", "edition"]].dropna().drop_duplicates()
+                .assign(number=lambda e: e["edition"].astype(int)).sort_values(["resource_id", "number"])
+                .groupby("resource_id")["edition"].agg(", ".join))
+    grouped = frame.groupby("resource_id")
+    canonical = pd.DataFrame({
+        "group": grouped["group"].first(),
+        "citation": spellings,
+        "editions": editions.reindex(grouped.size().index, fill_value=""),
+        "variants": grouped["citation"].nunique(),
+        "citations": grouped.size(),
+        "courses": grouped["course"].nunique(),
+    }).reset_index()
+    references = frame[["course", "kind", "citation", "edition", "resource_id", "key"]]
+    return canonical, references
+
+
+def deduplicate_files(paths, output_dir, threshold=DEFAULT_THRESHOLD):
+    """Run deduplicate over master .json/.jsonl files and write the two CSV tables."""
+    frame = citations_frame(record for path in paths for record in read_records(path))
+    canonical, references = deduplicate(frame, threshold)
+    os.makedirs(output_dir, exist_ok=True)
+    canonical_path = os.path.join(output_dir, "resources_canonical.csv")
+    references_path = os.path.join(output_dir, "resource_references.csv")
+    canonical.to_csv(canonical_path, index=False)
+    references.to_csv(references_path, index=False)
+    return canonical, references, canonical_path, references_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a canonical resource table from extracted syllabi.")
+    parser.add_argument("paths", nargs="+", metavar="JSON", help="master_syllabus.json or .jsonl files")
+    parser.add_argument("--out", default="output", help="directory for the CSV tables (default: output)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"similarity needed to merge two citations, 0-1 (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    canonical, references, canonical_path, references_path = deduplicate_files(args.paths, args.out, args.threshold)
+    print(f"{len(references)} citations -> {len(canonical)} canonical resources "
+          f"in {time.perf_counter() - started:.2f}s")
+    print(f"Canonical resources: {canonical_path}")
+    print(f"Per-course references: {references_path}")
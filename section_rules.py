@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import re
+from collections import namedtuple
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "section_rules.json")
+
+Transition = namedtuple("Transition", ["target", "resource", "clauses"])
+
+FIELDS = ("col0", "col1", "row")
+
+# "336C5B", "BIO-101", "MB 301", "23umb101"; not "CO1", "2023-24" or "100"
+DEFAULT_SUBJECT_CODE = r"(?=.*[A-Za-z])[A-Za-z]{0,6}[ -]?\d{2,4}[A-Za-z0-9]{0,6}"
+
+
+def normalize_row(row):
+    """
+    A table row (cell strings, None for spanned slots) as stripped strings,
+    "" for empty cells, or None if it has fewer than two cells.
+    """
+    if not row or len(row) < 2:
+        return None
+    return [cell.strip() if cell else "" for cell in row]
+
+
+def row_text(cells):
+    """All cells of a normalized row in one string, for "anywhere in the row" checks."""
+    return "\n".join(cells)
+
+
+class SectionRules:
+    """
+    Compiled section transitions from a rule file.
+
+    Each transition leaves one state ("from") for another ("to", or the same
+    state if omitted), optionally switching the resource list entries go to.
+    It fires when any of its match clauses holds; a clause maps fields to
+    lists of substrings, and holds when every field contains one of its
+    substrings. Fields are col0, col1 and row (any cell). Each field's
+    substrings are compiled into one regex, so checking a row costs a few
+    searches however many header variants there are. Transitions of a state
+    are tried in file order.
+
+    course_start holds match clauses for the row that opens a course (the
+    subject header row). Handbooks with many courses are split there.
+    subject_code is a regex that a whole first cell must match to be taken
+    as a course's subject code.
+    """
+
+    def __init__(self, config, digest=""):
+        self.digest = digest
+        self.by_state = {}
+        for transition in config.get("transitions", []):
+            self.by_state.setdefault(transition["from"], []).append(
+                Transition(transition.get("to", transition["from"]), transition.get("resource"),
+                           _compile_clauses(transition["match"])))
+        self.course_start = _compile_clauses(config.get("course_start", []))
+        self.subject_code = re.compile(config.get("subject_code", DEFAULT_SUBJECT_CODE))
+
+    def match(self, state, cells, text=None):
+        """
+        The first transition out of state that a normalized row triggers, or
+        None. text is row_text(cells) if the caller already has it.
+        """
+        for transition in self.by_state.get(state, ()):
+            for clause in transition.clauses:
+                if _clause_holds(clause, cells, text):
+                    return transition
+        return None
+
+    def starts_course(self, cells, text=None):
+        """Whether a normalized row opens a new course."""
+        return any(_clause_holds(clause, cells, text) for clause in self.course_start)
+
+    def is_subject_code(self, cell):
+        """Whether a normalized cell is a subject code."""
+        return self.subject_code.fullmatch(cell) is not None
+
+
+def _clause_holds(clause, cells, text=None):
+    """Whether every field of a compiled clause contains one of its substrings."""
+    for field, pattern in clause:
+        if field == "col0":
+            value = cells[0]
+        elif field == "col1":
+            value = cells[1]
+        else:
+            if text is None:
+                text = row_text(cells)
+            value = text
+        if not pattern.search(value):
+            return False
+    return True
+
+
+def _compile_clauses(match):
+    clauses = []
+    for clause in match:
+        unknown = set(clause) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown section rule field(s): {', '.join(sorted(unknown))}")
+        clauses.append([(field, _terms_pattern(clause[field])) for field in FIELDS if field in clause])
+    return clauses
+
+
+def _terms_pattern(terms):
+    # Longest first, so the alternation never stops at a shorter prefix
+    terms = sorted({term.strip() for term in terms}, key=len, reverse=True)
+    return re.compile("|".join(re.escape(term) for term in terms))
+
+
+def load_section_rules(path=DEFAULT_RULES_PATH):
+    """Read and compile a section rule file."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return SectionRules(json.loads(raw.decode('utf-8')), hashlib.sha256(raw).hexdigest())
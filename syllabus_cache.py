@@ -0,0 +1,143 @@
+import hashlib
+import mmap
+import os
+import pickle
+import tempfile
+
+# Bump whenever extract_syllabus can return a different dict for the same PDF,
+# so stale entries stop matching instead of having to be cleared by hand.
+EXTRACTOR_VERSION = "1"
+
+DEFAULT_CACHE_DIR = ".syllabus_cache"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def file_digest(pdf_path, salt="", chunk_size=1024 * 1024):
+    """
+    SHA-256 of the PDF's content plus the extractor version and salt, e.g. the
+    digest of the unit-name rule file the results depend on.
+
+    pdf_path may also be the PDF's content as a bytes-like object or mmap,
+    or a seekable binary file, which is left at the position it had.
+    """
+    h = hashlib.sha256()
+    h.update(f"syllabus-extractor:{EXTRACTOR_VERSION}:{salt}\0".encode())
+    if isinstance(pdf_path, (bytes, bytearray, memoryview, mmap.mmap)):
+        h.update(pdf_path)
+    elif hasattr(pdf_path, "read"):
+        if not pdf_path.seekable():
+            raise ValueError("file_digest needs a seekable file; buffer streams with pdf_sources.open_source")
+        start = pdf_path.tell()
+        for chunk in iter(lambda: pdf_path.read(chunk_size), b''):
+            h.update(chunk)
+        pdf_path.seek(start)
+    else:
+        with open(pdf_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                h.update(chunk)
+    return h.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Persistent, content-addressed store for extract_syllabus results.
+
+    Entries live as one pickle per digest in cache_dir. Pickle keeps the
+    returned dict exactly as extract_syllabus built it (e.g. the integer CO
+    keys in course_outcomes), which a JSON round-trip would not. Writes go
+    through a temp file and os.replace, so worker processes can share the
+    directory safely.
+
+    key_salt is mixed into every key, so changing it (for instance when the
+    unit-name rules change) makes old entries miss.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES, key_salt=""):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.key_salt = key_salt
+
+    def digest(self, pdf_path):
+        """Cache key for a PDF file or in-memory PDF (see file_digest)."""
+        return file_digest(pdf_path, self.key_salt)
+
+    def _entry_path(self, digest):
+        return os.path.join(self.cache_dir, f"{digest}.pkl")
+
+    def get(self, digest):
+        """Return the cached syllabus dict for digest, or None on a miss."""
+        path = self._entry_path(digest)
+        try:
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        # Touch the entry so eviction drops least recently used entries first
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def put(self, digest, syllabus_data):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(syllabus_data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._entry_path(digest))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def invalidate(self, pdf_path):
+        """Drop the entry for one PDF. Returns True if an entry was removed."""
+        path = self._entry_path(self.digest(pdf_path))
+        if os.path.exists(path):
+            os.remove(path)
+            return True
+        return False
+
+    def clear(self):
+        """Remove every entry. Returns the number of entries removed."""
+        removed = 0
+        for path, _, _ in self._entries():
+            os.remove(path)
+            removed += 1
+        return removed
+
+    def evict(self):
+        """
+        Delete least recently used entries until the cache fits in max_bytes.
+        Returns the number of entries removed.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def _entries(self):
+        """List (path, size, mtime) for every entry on disk."""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.pkl'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, st.st_size, st.st_mtime))
+        return entries
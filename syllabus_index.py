@@ -0,0 +1,264 @@
+"""
+Full-text index over extracted syllabi.
+
+Keeps a SQLite database with one row per syllabus and one searchable entry per
+unit name, topic, course outcome and resource, indexed with FTS5, so
+questions like "which courses cover PCR?" are answered without loading
+master_syllabus.json.
+
+    python syllabus_index.py build output/master_syllabus.json [--db syllabus_index.db]
+    python syllabus_index.py search PCR [--kind topic] [--courses] [--limit 20]
+    python syllabus_index.py remove KEY...
+    python syllabus_index.py stats
+
+Records are upserted per PDF, keyed like generate_json_for_pdf (the
+sanitized file name), so re-indexing a PDF replaces its old entries.
+pdf_syllabus_extractor.py --index DB keeps an index up to date during a run.
+"""
+import argparse
+import contextlib
+import json
+import sqlite3
+import sys
+import time
+
+DEFAULT_INDEX_PATH = "syllabus_index.db"
+
+# Entry kinds, in the order they are stored
+KINDS = ("unit", "topic", "outcome", "text_book", "reference_book", "web_resource")
+
+RESOURCE_KINDS = {
+    "text_books": "text_book",
+    "reference_books": "reference_book",
+    "web_resources": "web_resource",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS syllabi (
+    key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    unit INTEGER,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_key ON entries(key);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    text, kind, content='entries', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, text, kind) VALUES (new.id, new.text, new.kind);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, text, kind) VALUES ('delete', old.id, old.text, old.kind);
+END;
+"""
+
+
+def syllabus_entries(syllabus_data):
+    """(kind, unit number or None, text) for everything searchable in a syllabus."""
+    for unit in syllabus_data.get("units", []):
+        number = unit.get("Unit_Number")
+        if unit.get("Unit_Name"):
+            yield "unit", number, unit["Unit_Name"]
+        for topic in unit.get("Topics", []):
+            yield "topic", number, topic
+    for outcome in syllabus_data.get("course_outcomes", {}).values():
+        yield "outcome", None, outcome
+    for resource_type, kind in RESOURCE_KINDS.items():
+        for text in syllabus_data.get("resources", {}).get(resource_type, []):
+            yield kind, None, text
+
+
+def match_expression(query):
+    """
+    FTS5 query for plain search text: every word must occur, and a trailing
+    '*' keeps its prefix meaning. Quoting each word stops punctuation such as
+    '-' or ':' from being read as FTS5 syntax.
+    """
+    terms = []
+    for word in query.split():
+        prefix = word.endswith("*")
+        word = word.rstrip("*")
+        if word:
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+    return " ".join(terms)
+
+
+class SyllabusIndex:
+    """
+    SQLite FTS5 index of syllabi.
+
+    Entries live in a plain table, and entries_fts indexes their text as an
+    external-content FTS5 table kept in sync by triggers. Deleting a
+    syllabus's entries by key is then an indexed lookup instead of a scan of
+    the full-text index.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        # Rank by the text column only; kind is indexed just for filtering
+        with self.conn:
+            self.conn.execute("INSERT INTO entries_fts(entries_fts, rank) VALUES ('rank', 'bm25(1.0, 0.0)')")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def upsert(self, key, syllabus_data, commit=True):
+        """Index one syllabus under key, replacing anything indexed for it before."""
+        with self.conn if commit else contextlib.nullcontext():
+            self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.conn.execute("INSERT OR REPLACE INTO syllabi (key, data, indexed_at) VALUES (?, ?, ?)",
+                              (key, json.dumps(syllabus_data), time.time()))
+            self.conn.executemany("INSERT INTO entries (key, kind, unit, text) VALUES (?, ?, ?, ?)",
+                                  [(key, kind, unit, text) for kind, unit, text in syllabus_entries(syllabus_data)])
+
+    def upsert_pdf_json(self, pdf_json, commit=True):
+        """Index a generate_json_for_pdf record ({name: {name_Syllabus: data}})."""
+        for key, wrapped in pdf_json.items():
+            self.upsert(key, wrapped[f"{key}_Syllabus"], commit=commit)
+
+    def remove(self, key):
+        """Drop one syllabus. Returns True if it was indexed."""
+        with self.conn:
+            self.conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return self.conn.execute("DELETE FROM syllabi WHERE key = ?", (key,)).rowcount > 0
+
+    def build(self, path):
+        """
+        Upsert every record from a master_syllabus.json or .jsonl file in one
+        transaction. Returns the number of syllabi indexed.
+        """
+        count = 0
+        with self.conn:
+            for pdf_json in read_records(path):
+                self.upsert_pdf_json(pdf_json, commit=False)
+                count += len(pdf_json)
+        return count
+
+    def search(self, query, kinds=None, limit=20, raw=False):
+        """
+        Best-matching entries for query, as dicts with key, kind, unit and text.
+
+        kinds restricts the entry kinds searched (see KINDS). With raw, query
+        is passed to FTS5 as-is (phrases, OR, NEAR, prefixes).
+        """
+        # Rank and limit inside FTS5 first, so only the top rows are joined
+        sql = ("SELECT e.key, e.kind, e.unit, e.text FROM "
+               "(SELECT rowid, rank FROM entries_fts WHERE entries_fts MATCH ? ORDER BY rank LIMIT ?) AS hit "
+               "JOIN entries e ON e.id = hit.rowid ORDER BY hit.rank")
+        rows = self.conn.execute(sql, (self._match(query, kinds, raw), limit))
+        return [{"key": key, "kind": kind, "unit": unit, "text": text} for key, kind, unit, text in rows]
+
+    def courses(self, query, kinds=None, limit=20, raw=False):
+        """Syllabi with a matching entry, best first, as dicts with key and hits."""
+        sql = ("SELECT e.key, COUNT(*), MIN(hit.rank) AS best FROM "
+               "(SELECT rowid, rank FROM entries_fts WHERE entries_fts MATCH ?) AS hit "
+               "JOIN entries e ON e.id = hit.rowid GROUP BY e.key ORDER BY best LIMIT ?")
+        rows = self.conn.execute(sql, (self._match(query, kinds, raw), limit))
+        return [{"key": key, "hits": hits} for key, hits, _ in rows]
+
+    def _match(self, query, kinds, raw):
+        """
+        MATCH expression limited to the text column, and to kinds if given.
+        Filtering on the indexed kind column lets FTS5 intersect the two
+        posting lists instead of ranking every text match first.
+        """
+        expression = "text : (" + (query if raw else match_expression(query)) + ")"
+        if kinds:
+            expression += " AND kind : (" + " OR ".join(f'"{kind}"' for kind in kinds) + ")"
+        return expression
+
+    def get(self, key):
+        """The indexed syllabus dict for key, or None."""
+        row = self.conn.execute("SELECT data FROM syllabi WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def stats(self):
+        syllabi = self.conn.execute("SELECT COUNT(*) FROM syllabi").fetchone()[0]
+        by_kind = dict(self.conn.execute("SELECT kind, COUNT(*) FROM entries GROUP BY kind"))
+        return {"syllabi": syllabi, "entries": by_kind}
+
+
+def read_records(path):
+    """Yield generate_json_for_pdf records from a master .json or .jsonl file."""
+    with open(path, encoding='utf-8') as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            for key, wrapped in json.load(f).items():
+                yield {key: wrapped}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build and query a full-text index of extracted syllabi.")
+    parser.add_argument("--db", default=DEFAULT_INDEX_PATH, help=f"index database (default: {DEFAULT_INDEX_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="index master_syllabus.json or .jsonl files")
+    build.add_argument("paths", nargs="+", metavar="JSON")
+    search = sub.add_parser("search", help="find topics, units, outcomes or resources")
+    search.add_argument("query", nargs="+")
+    search.add_argument("--kind", action="append", choices=KINDS, help="only search this kind (repeatable)")
+    search.add_argument("--courses", action="store_true", help="list matching syllabi instead of entries")
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--fts", action="store_true", help="pass the query to FTS5 unchanged")
+    search.add_argument("--json", action="store_true", help="print results as JSON")
+    remove = sub.add_parser("remove", help="drop syllabi from the index")
+    remove.add_argument("keys", nargs="+", metavar="KEY")
+    sub.add_parser("stats", help="count indexed syllabi and entries")
+    args = parser.parse_args()
+
+    with SyllabusIndex(args.db) as index:
+        if args.command == "build":
+            for path in args.paths:
+                started = time.perf_counter()
+                count = index.build(path)
+                print(f"Indexed {count} syllabi from {path} in {time.perf_counter() - started:.2f}s")
+        elif args.command == "search":
+            query = " ".join(args.query)
+            started = time.perf_counter()
+            try:
+                if args.courses:
+                    results = index.courses(query, args.kind, args.limit, raw=args.fts)
+                else:
+                    results = index.search(query, args.kind, args.limit, raw=args.fts)
+            except sqlite3.OperationalError as e:
+                print(f"Invalid query: {e}", file=sys.stderr)
+                raise SystemExit(2)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if args.json:
+                json.dump(results, sys.stdout, indent=2)
+                sys.stdout.write("\n")
+            else:
+                for r in results:
+                    if args.courses:
+                        print(f"{r['key']}  ({r['hits']} match{'es' if r['hits'] != 1 else ''})")
+                    else:
+                        unit = f" unit {r['unit']}" if r['unit'] is not None else ""
+                        print(f"{r['key']}  [{r['kind']}{unit}]  {r['text']}")
+                print(f"{len(results)} result(s) in {elapsed_ms:.1f} ms", file=sys.stderr)
+        elif args.command == "remove":
+            for key in args.keys:
+                print(f"Removed {key}" if index.remove(key) else f"Not indexed: {key}")
+        elif args.command == "stats":
+            stats = index.stats()
+            print(f"Syllabi: {stats['syllabi']}")
+            for kind in KINDS:
+                print(f"  {kind}: {stats['entries'].get(kind, 0)}")
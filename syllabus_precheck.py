@@ -0,0 +1,90 @@
+"""
+Cheap first-pages check that rejects PDFs which are clearly not syllabi.
+
+Input folders also hold timetables, circulars and scanned images. The only
+safe rejection is a hard negative: if the first few pages have no text at
+all, they are scanned images (or blank), which the table extractor cannot
+read either. A page with text is never rejected by default, because real
+syllabi often open with cover and regulation pages.
+
+With markers, text pages must also carry a syllabus signature:
+- a syllabus marker ("Course Objectives", "Course Outcomes", "Syllabus") or
+  at least two CO rows (CO1, CO2, ...);
+- or a subject code on a page with a ruled table that mentions credits.
+This also rejects timetables and circulars, but only suits folders whose
+syllabi reach their tables within the checked pages.
+
+The check stops at the first page that passes, so real syllabi pay for at
+most the layout of their first pages, and that layout is reused by
+extract_syllabus.
+"""
+import re
+
+import pdfplumber
+
+from pdf_sources import open_source
+
+PRECHECK_PAGES = 3
+
+# Rejection reasons
+SCANNED = "scanned"
+NO_TEXT = "no text"
+NO_MARKERS = "no syllabus markers"
+
+_MARKERS = re.compile(r"course\s*objectives?|course\s*outcomes?|syllabus", re.IGNORECASE)
+# Page chars joined without separators, so cells run together ("CO1To gain")
+_CO_ROW = re.compile(r"CO\s?([1-9])(?!\d)")
+_SUBJECT_CODE = re.compile(r"\b(?=[A-Z]*\d)(?=\d*[A-Z])[A-Z0-9]{5,10}\b")
+_CREDITS = re.compile(r"credit", re.IGNORECASE)
+
+
+class NotASyllabus(Exception):
+    """Raised by extract_syllabus(precheck_pages=N) for a rejected PDF."""
+
+    def __init__(self, reason, detail):
+        super().__init__(f"{reason}: {detail}")
+        self.reason = reason
+        self.detail = detail
+
+
+def page_looks_like_syllabus(page):
+    """Whether one page's text carries a syllabus signature."""
+    chars = "".join(char["text"] for char in page.chars)
+    if _MARKERS.search(chars) or len(set(_CO_ROW.findall(chars))) >= 2:
+        return True
+    if not (page.horizontal_edges and page.vertical_edges and _CREDITS.search(chars)):
+        return False
+    # Codes need word boundaries, which only the laid-out text has
+    return bool(_SUBJECT_CODE.search(page.extract_text() or ""))
+
+
+def classify_pages(pages, markers=False):
+    """
+    None unless the pages (pdfplumber pages, first ones of a PDF) are a hard
+    negative, otherwise a (reason, detail) tuple. With markers, text pages
+    without a syllabus signature are rejected too.
+    """
+    checked = 0
+    images = 0
+    has_text = False
+    for page in pages:
+        checked += 1
+        if not page.chars:
+            images += len(page.images)
+            continue
+        has_text = True
+        if not markers or page_looks_like_syllabus(page):
+            return None
+    if not checked:
+        return NO_TEXT, "the PDF has no pages"
+    if not has_text:
+        if images:
+            return SCANNED, f"first {checked} page(s) are images without a text layer"
+        return NO_TEXT, f"first {checked} page(s) have no text"
+    return NO_MARKERS, f"no Course Objectives, Course Outcomes or CO rows in the first {checked} page(s)"
+
+
+def precheck_pdf(pdf_path, max_pages=PRECHECK_PAGES, markers=False):
+    """classify_pages for the first max_pages pages of a PDF (any pdf_sources source)."""
+    with pdfplumber.open(open_source(pdf_path)) as pdf:
+        return classify_pages(pdf.pages[:max_pages], markers)
@@ -0,0 +1,124 @@
+import time
+from contextlib import contextmanager
+
+
+class StageTimer:
+    """
+    Records wall time and call counts per pipeline stage.
+
+    Stages timed for a specific page (extract_tables, the row state machine)
+    are also kept per page, so slow pages can be pinpointed. Use stage() as a
+    context manager, or start()/stop() around code that is awkward to indent.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.stages = {}
+        self.pages = {}
+
+    def start(self):
+        return time.perf_counter()
+
+    def stop(self, name, started, page=None):
+        elapsed = time.perf_counter() - started
+        entry = self.stages.setdefault(name, [0.0, 0])
+        entry[0] += elapsed
+        entry[1] += 1
+        if page is not None:
+            page_stages = self.pages.setdefault(page, {})
+            page_stages[name] = page_stages.get(name, 0.0) + elapsed
+
+    @contextmanager
+    def stage(self, name, page=None):
+        started = self.start()
+        try:
+            yield
+        finally:
+            self.stop(name, started, page)
+
+    def to_dict(self):
+        """Plain-dict form, safe to return from a worker process."""
+        return {
+            "stages": {name: {"seconds": s, "calls": c} for name, (s, c) in self.stages.items()},
+            "pages": {str(page): stages for page, stages in self.pages.items()},
+        }
+
+
+class _NullStage:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+class NullTimer:
+    """Stand-in used when timing is off: every call is a no-op."""
+    enabled = False
+    _stage = _NullStage()
+
+    def start(self):
+        return 0.0
+
+    def stop(self, name, started, page=None):
+        pass
+
+    def stage(self, name, page=None):
+        return self._stage
+
+    def to_dict(self):
+        return {"stages": {}, "pages": {}}
+
+
+NULL_TIMER = NullTimer()
+
+
+def build_report(file_timings, run_timer=None, top_n=10):
+    """
+    Combine per-file StageTimer dicts into one report.
+
+    file_timings maps file name -> {"seconds": wall time, "stages": ..., "pages": ...}.
+    run_timer holds run-level stages such as writing the master JSON.
+    """
+    totals = {}
+    for timing in file_timings.values():
+        for name, entry in timing["stages"].items():
+            total = totals.setdefault(name, {"seconds": 0.0, "calls": 0})
+            total["seconds"] += entry["seconds"]
+            total["calls"] += entry["calls"]
+    if run_timer is not None:
+        for name, entry in run_timer.to_dict()["stages"].items():
+            totals[name] = dict(entry)
+
+    slowest_files = sorted(
+        ({"file": name, "seconds": timing["seconds"]} for name, timing in file_timings.items()),
+        key=lambda f: f["seconds"], reverse=True)[:top_n]
+    slowest_pages = sorted(
+        ({"file": name, "page": int(page), "seconds": sum(stages.values()), "stages": stages}
+         for name, timing in file_timings.items()
+         for page, stages in timing["pages"].items()),
+        key=lambda p: p["seconds"], reverse=True)[:top_n]
+
+    return {
+        "totals": totals,
+        "files": file_timings,
+        "slowest_files": slowest_files,
+        "slowest_pages": slowest_pages,
+    }
+
+
+def format_report(report):
+    """Human-readable summary: stage totals and the slowest files and pages."""
+    lines = ["Stage timings:"]
+    for name, entry in sorted(report["totals"].items(), key=lambda e: e[1]["seconds"], reverse=True):
+        lines.append(f"  {name:20s} {entry['seconds']:9.3f} s  {entry['calls']:7d} call(s)")
+    if report["slowest_files"]:
+        lines.append("Slowest files:")
+        for f in report["slowest_files"]:
+            lines.append(f"  {f['seconds']:9.3f} s  {f['file']}")
+    if report["slowest_pages"]:
+        lines.append("Slowest pages:")
+        for p in report["slowest_pages"]:
+            detail = ", ".join(f"{name} {s:.3f} s" for name, s in p["stages"].items())
+            lines.append(f"  {p['seconds']:9.3f} s  {p['file']} page {p['page']} ({detail})")
+    return "\n".join(lines)
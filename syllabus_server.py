@@ -0,0 +1,131 @@
+"""
+Long-lived extraction service.
+
+Keeps the interpreter, pdfplumber and the compiled rule files warm, so
+each request only pays for the extraction itself. Requests are handled one at
+a time (extraction is CPU-bound; run several servers for parallelism).
+
+    python syllabus_server.py [--host 127.0.0.1] [--port 8765]
+    python syllabus_server.py --unix /tmp/syllabus.sock
+
+Endpoints:
+    GET  /health                  -> {"status": "ok"}
+    POST /extract[?name=X.pdf]    PDF body -> extract_syllabus JSON; with name,
+                                  wrapped like generate_json_for_pdf
+    POST /summary[?name=X.pdf]    PDF body -> summary PDF (reportlab is only
+                                  imported on the first /summary request)
+"""
+import argparse
+import io
+import json
+import os
+import socketserver
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from table_backends import DEFAULT_BACKEND, TABLE_BACKENDS
+from pdf_syllabus_extractor import (extract_syllabus, generate_json_for_pdf, get_renderer,
+                                    get_section_rules, get_unit_name_rules)
+
+
+class SyllabusRequestHandler(BaseHTTPRequestHandler):
+    server_version = "SyllabusExtractor/1.0"
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/health":
+            self._send_json(200, {"status": "ok"})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        name = parse_qs(url.query).get("name", [None])[0]
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        if not body:
+            self._send_json(400, {"error": "empty request body, expected a PDF"})
+            return
+        try:
+            if url.path == "/extract":
+                syllabus_data = extract_syllabus(body, backend=self.server.backend)
+                if name:
+                    syllabus_data = generate_json_for_pdf(syllabus_data, name)
+                self._send_json(200, syllabus_data)
+            elif url.path == "/summary":
+                syllabus_data = extract_syllabus(body, backend=self.server.backend)
+                out = io.BytesIO()
+                get_renderer().render(syllabus_data, name or "upload.pdf", out)
+                self._send(200, "application/pdf", out.getvalue())
+            else:
+                self._send_json(404, {"error": "not found"})
+        except Exception as e:
+            self._send_json(422, {"error": f"could not process PDF: {e}"})
+
+    def _send_json(self, status, payload):
+        self._send(status, "application/json", json.dumps(payload).encode('utf-8'))
+
+    def _send(self, status, content_type, data):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self):
+        # Unix socket peers have no (host, port) address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class SyllabusHTTPServer(HTTPServer):
+    quiet = False
+    backend = DEFAULT_BACKEND
+
+
+class UnixSyllabusServer(socketserver.UnixStreamServer):
+    quiet = False
+    backend = DEFAULT_BACKEND
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        super().server_bind()
+
+
+def make_server(host="127.0.0.1", port=8765, unix_socket=None, quiet=False, backend=DEFAULT_BACKEND):
+    """Create the server and warm everything a request needs except reportlab."""
+    get_unit_name_rules()
+    get_section_rules()
+    if unix_socket:
+        server = UnixSyllabusServer(unix_socket, SyllabusRequestHandler)
+    else:
+        server = SyllabusHTTPServer((host, port), SyllabusRequestHandler)
+    server.quiet = quiet
+    server.backend = backend
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve syllabus extraction over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on (default: 8765)")
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--quiet", action="store_true", help="do not log each request")
+    parser.add_argument("--backend", choices=sorted(TABLE_BACKENDS), default=DEFAULT_BACKEND,
+                        help=f"table extraction engine (default: {DEFAULT_BACKEND})")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.unix, args.quiet, args.backend)
+    where = args.unix or f"http://{args.host}:{server.server_address[1]}"
+    print(f"Serving syllabus extraction on {where}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.unix and os.path.exists(args.unix):
+            os.remove(args.unix)
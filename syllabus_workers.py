@@ -0,0 +1,204 @@
+"""
+Supervised worker processes for batch runs.
+
+Each file is handled by a long-lived worker process, so a PDF that hangs or
+grows without bound can be stopped without stalling the batch:
+- timeout: wall-clock seconds a single file may take; the worker is killed
+  and replaced when it runs over. Off by default, since a large PDF may
+  legitimately take minutes.
+- max_memory_mb: how much a worker may grow while handling a single file.
+  It is enforced with RLIMIT_AS, so going over shows up as a MemoryError.
+- max_files: a worker is replaced after this many files, so anything
+  pdfminer leaves behind between files cannot build up.
+
+Workers stay warm between files, so healthy files cost no more than they did
+under ProcessPoolExecutor.
+"""
+import os
+import time
+import multiprocessing
+from multiprocessing.connection import wait
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DEFAULT_TIMEOUT = 0  # no limit
+DEFAULT_MAX_FILES = 50
+
+# Failure reasons
+TIMEOUT = "timeout"
+MEMORY = "memory"
+CRASHED = "crashed"
+
+
+def memory_limits_supported():
+    return resource is not None and hasattr(resource, "RLIMIT_AS") and os.path.exists("/proc/self/statm")
+
+
+def _address_space_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _worker_main(func, conn, max_memory_mb):
+    """Run func on each item received over conn until told to stop."""
+    _, hard = resource.getrlimit(resource.RLIMIT_AS) if max_memory_mb else (None, None)
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        index, item = task
+        if max_memory_mb:
+            # Budget on top of what the worker already holds, so leftovers
+            # from earlier files do not eat into this file's allowance
+            limit = _address_space_bytes() + max_memory_mb * 1024 * 1024
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+        result = failure = None
+        try:
+            result = func(item)
+        except MemoryError:
+            failure = (MEMORY, f"exceeded {max_memory_mb} MB" if max_memory_mb else "out of memory")
+        except Exception as e:
+            failure = (CRASHED, f"{type(e).__name__}: {e}")
+        if max_memory_mb:
+            # Lift the limit first so reporting back cannot fail too
+            resource.setrlimit(resource.RLIMIT_AS, (hard, hard))
+        conn.send((index, result, failure))
+        if failure is not None and failure[0] == MEMORY:
+            # The heap is in no state for another file
+            break
+    conn.close()
+
+
+class _Worker:
+    def __init__(self, func, max_memory_mb):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker_main,
+                                               args=(func, child_conn, max_memory_mb), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.files = 0
+        self.task = None
+        self.deadline = None
+
+    def send(self, index, item, timeout, now):
+        self.conn.send((index, item))
+        self.files += 1
+        self.task = index
+        self.deadline = now + timeout if timeout else None
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(5)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class SupervisedPool:
+    """
+    Run func over items in worker processes with per-item budgets.
+
+    map() yields (result, failure) per item in input order, as soon as each
+    leading item is done. failure is None on success, otherwise a
+    (reason, detail) tuple with reason TIMEOUT, MEMORY or CRASHED, and result
+    is None. Items are taken from the iterable only when a worker is free,
+    so a stream of large items (PDF bytes read from an archive) is never
+    held in memory at once.
+    """
+
+    def __init__(self, func, workers, timeout=DEFAULT_TIMEOUT, max_memory_mb=None,
+                 max_files=DEFAULT_MAX_FILES):
+        if max_memory_mb and not memory_limits_supported():
+            raise ValueError("Memory limits need RLIMIT_AS and /proc (Linux)")
+        self.func = func
+        self.workers = workers
+        self.timeout = timeout or None
+        self.max_memory_mb = max_memory_mb or None
+        self.max_files = max_files or None
+        self.recycled = 0
+
+    def map(self, items):
+        items = iter(items)
+        submitted = 0
+        exhausted = False
+        done = {}
+        next_out = 0
+        idle = []
+        busy = []
+        try:
+            while True:
+                # Hand out work, starting fresh workers as needed
+                while not exhausted and len(busy) < self.workers:
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    worker = idle.pop() if idle else _Worker(self.func, self.max_memory_mb)
+                    worker.send(submitted, item, self.timeout, time.monotonic())
+                    submitted += 1
+                    busy.append(worker)
+                if not busy:
+                    # Every item handed out has been yielded
+                    break
+
+                deadlines = [w.deadline for w in busy if w.deadline is not None]
+                wait_for = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+                ready = wait([w.conn for w in busy], wait_for)
+
+                now = time.monotonic()
+                for worker in list(busy):
+                    if worker.conn in ready:
+                        try:
+                            index, result, failure = worker.conn.recv()
+                        except (EOFError, OSError):
+                            index, result = worker.task, None
+                            worker.process.join()
+                            failure = self._crash_failure(worker.process.exitcode)
+                            busy.remove(worker)
+                            worker.kill()
+                            done[index] = (result, failure)
+                            continue
+                        done[index] = (result, failure)
+                        busy.remove(worker)
+                        if failure is not None and failure[0] == MEMORY:
+                            worker.kill()
+                        elif self.max_files and worker.files >= self.max_files:
+                            worker.stop()
+                            self.recycled += 1
+                        else:
+                            idle.append(worker)
+                    elif worker.deadline is not None and now >= worker.deadline:
+                        busy.remove(worker)
+                        worker.kill()
+                        done[worker.task] = (None, (TIMEOUT, f"exceeded {self.timeout:g} s"))
+
+                while next_out in done:
+                    yield done.pop(next_out)
+                    next_out += 1
+        finally:
+            for worker in idle:
+                worker.stop()
+            for worker in busy:
+                worker.kill()
+
+    def _crash_failure(self, exitcode):
+        if exitcode is not None and exitcode < 0:
+            detail = f"worker killed by signal {-exitcode}"
+        else:
+            detail = f"worker exited with code {exitcode}"
+        if self.max_memory_mb:
+            # Allocations that fail in C code can abort instead of raising
+            detail += f" (memory limit {self.max_memory_mb} MB may have been hit)"
+        return CRASHED, detail
@@ -0,0 +1,249 @@
+"""
+Table backends: the layer that turns a pdfplumber page into table rows.
+
+A backend has a name and an extract_tables(page) method returning the same
+shape as pdfplumber's page.extract_tables(): a list of tables, each a list of
+rows, each a list of cell strings (None where a spanning cell covers the
+slot). extract_syllabus only ever sees those rows, so its state machine
+behaves the same whichever backend produced them.
+"""
+from bisect import bisect_left, bisect_right
+from itertools import groupby
+
+from pdfplumber import utils
+
+# pdfplumber's default "lines" strategy settings, mirrored by the grid engine
+SNAP_TOLERANCE = 3
+JOIN_TOLERANCE = 3
+EDGE_MIN_LENGTH = 3
+EDGE_MIN_LENGTH_PREFILTER = 1
+INTERSECTION_TOLERANCE = 3
+TEXT_SETTINGS = {"x_tolerance": 3, "y_tolerance": 3}
+
+
+class PdfplumberTables:
+    """pdfplumber's general-purpose table finder. Accurate on any layout."""
+    name = "pdfplumber"
+
+    def extract_tables(self, page):
+        return page.extract_tables()
+
+
+class RuledGridTables:
+    """
+    Fast engine for tables drawn with ruling lines on every cell border.
+
+    It follows the same steps as pdfplumber's "lines" strategy: snap and join
+    the page's edges, intersect them, find the smallest cell at each
+    intersection, group cells into tables by shared corners. But it works on
+    plain tuples with sorted indexes instead of pairwise scans, and assigns
+    each char to its cell with a bisect instead of testing every char against
+    every row and cell. Cell text still comes from pdfplumber's extract_text,
+    so it matches the default backend.
+
+    Pages whose cells do not form a clean grid (overlapping cells) are handed
+    to the fallback backend.
+    """
+    name = "grid"
+
+    def __init__(self, fallback=None):
+        self.fallback = fallback or PdfplumberTables()
+        self.fallback_pages = 0
+
+    def extract_tables(self, page):
+        tables = self._grid_tables(page)
+        if tables is None:
+            self.fallback_pages += 1
+            return self.fallback.extract_tables(page)
+        return tables
+
+    def _grid_tables(self, page):
+        v_edges, h_edges = _merged_edges(page)
+        if not v_edges or not h_edges:
+            return []
+        cells = _cells(_intersections(v_edges, h_edges))
+        chars = page.chars
+        result = []
+        for table_cells in _cells_to_tables(cells):
+            rows = _extract_table(table_cells, chars)
+            if rows is None:
+                return None
+            result.append(rows)
+        return result
+
+
+TABLE_BACKENDS = {
+    PdfplumberTables.name: PdfplumberTables,
+    RuledGridTables.name: RuledGridTables,
+}
+
+DEFAULT_BACKEND = PdfplumberTables.name
+
+
+def get_table_backend(name=DEFAULT_BACKEND):
+    """Instantiate a backend by name."""
+    try:
+        return TABLE_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown table backend {name!r}; choose from {', '.join(TABLE_BACKENDS)}")
+
+
+def _snap(edges, tolerance):
+    """
+    Snap edge positions (item 0) within tolerance of each other, chaining, to
+    the cluster average - as pdfplumber's snap_objects does.
+    """
+    edges = sorted(edges, key=lambda e: e[0])
+    snapped = []
+    cluster = []
+    for edge in edges:
+        if cluster and edge[0] > cluster[-1][0] + tolerance:
+            snapped.extend(_move(cluster))
+            cluster = []
+        cluster.append(edge)
+    if cluster:
+        snapped.extend(_move(cluster))
+    return snapped
+
+
+def _move(cluster):
+    avg = sum(e[0] for e in cluster) / len(cluster)
+    return [(avg, e[1], e[2]) for e in cluster]
+
+
+def _join(edges, tolerance):
+    """Join collinear edges (same position) whose spans touch within tolerance."""
+    joined = []
+    for pos, group in groupby(sorted(edges), key=lambda e: e[0]):
+        group = list(group)
+        start, end = group[0][1], group[0][2]
+        for _, s, e in group[1:]:
+            if s <= end + tolerance:
+                end = max(end, e)
+            else:
+                joined.append((pos, start, end))
+                start, end = s, e
+        joined.append((pos, start, end))
+    return joined
+
+
+def _merged_edges(page):
+    """
+    Vertical edges as (x, top, bottom) and horizontal edges as (y, x0, x1),
+    snapped, joined and length-filtered like pdfplumber's get_edges().
+    """
+    v = [(e["x0"], e["top"], e["bottom"])
+         for e in utils.filter_edges(page.edges, "v", min_length=EDGE_MIN_LENGTH_PREFILTER)]
+    h = [(e["top"], e["x0"], e["x1"])
+         for e in utils.filter_edges(page.edges, "h", min_length=EDGE_MIN_LENGTH_PREFILTER)]
+    v = [e for e in _join(_snap(v, SNAP_TOLERANCE), JOIN_TOLERANCE) if e[2] - e[1] >= EDGE_MIN_LENGTH]
+    h = [e for e in _join(_snap(h, SNAP_TOLERANCE), JOIN_TOLERANCE) if e[2] - e[1] >= EDGE_MIN_LENGTH]
+    return v, h
+
+
+def _intersections(v_edges, h_edges, tolerance=INTERSECTION_TOLERANCE):
+    """Map each (x, y) crossing to the sets of vertical and horizontal edge ids through it."""
+    h_sorted = sorted(range(len(h_edges)), key=lambda i: h_edges[i])
+    h_ys = [h_edges[i][0] for i in h_sorted]
+    points = {}
+    for vi, (x, top, bottom) in enumerate(v_edges):
+        lo = bisect_left(h_ys, top - tolerance)
+        hi = bisect_right(h_ys, bottom + tolerance)
+        for hi_index in h_sorted[lo:hi]:
+            y, x0, x1 = h_edges[hi_index]
+            if x0 - tolerance <= x <= x1 + tolerance:
+                vs, hs = points.setdefault((x, y), (set(), set()))
+                vs.add(vi)
+                hs.add(hi_index)
+    return points
+
+
+def _cells(points):
+    """Smallest cell with its top-left corner at each intersection."""
+    by_x = {}
+    by_y = {}
+    for x, y in sorted(points):
+        by_x.setdefault(x, []).append(y)
+        by_y.setdefault(y, []).append(x)
+
+    cells = []
+    for x, y in sorted(points):
+        vs, hs = points[(x, y)]
+        ys = by_x[x]
+        xs = by_y[y]
+        found = None
+        for below_y in ys[bisect_right(ys, y):]:
+            below_vs, below_hs = points[(x, below_y)]
+            if not vs & below_vs:
+                continue
+            for right_x in xs[bisect_right(xs, x):]:
+                right_vs, right_hs = points[(right_x, y)]
+                if not hs & right_hs:
+                    continue
+                corner = points.get((right_x, below_y))
+                if corner is not None and corner[0] & right_vs and corner[1] & below_hs:
+                    found = (x, y, right_x, below_y)
+                    break
+            if found:
+                break
+        if found:
+            cells.append(found)
+    return cells
+
+
+def _cells_to_tables(cells):
+    """Group cells sharing a corner into tables, ordered top-to-bottom, left-to-right."""
+    parent = list(range(len(cells)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    corner_owner = {}
+    for i, (x0, top, x1, bottom) in enumerate(cells):
+        for corner in ((x0, top), (x0, bottom), (x1, top), (x1, bottom)):
+            j = corner_owner.setdefault(corner, i)
+            if j != i:
+                parent[find(i)] = find(j)
+
+    groups = {}
+    for i, cell in enumerate(cells):
+        groups.setdefault(find(i), []).append(cell)
+    tables = sorted(groups.values(), key=lambda t: min((c[1], c[0]) for c in t))
+    return [t for t in tables if len(t) > 1]
+
+
+def _extract_table(cells, chars):
+    """Rows of cell text for one table, or None if its cells overlap."""
+    xs = sorted({c[0] for c in cells} | {c[2] for c in cells})
+    ys = sorted({c[1] for c in cells} | {c[3] for c in cells})
+    slots = {}
+    for index, (x0, top, x1, bottom) in enumerate(cells):
+        for i in range(bisect_left(xs, x0), bisect_left(xs, x1)):
+            for j in range(bisect_left(ys, top), bisect_left(ys, bottom)):
+                if slots.setdefault((i, j), index) != index:
+                    return None
+
+    cell_chars = [[] for _ in cells]
+    x_min, x_max, y_min, y_max = xs[0], xs[-1], ys[0], ys[-1]
+    for char in chars:
+        h_mid = (char["x0"] + char["x1"]) / 2
+        v_mid = (char["top"] + char["bottom"]) / 2
+        if not (x_min <= h_mid < x_max and y_min <= v_mid < y_max):
+            continue
+        index = slots.get((bisect_right(xs, h_mid) - 1, bisect_right(ys, v_mid) - 1))
+        if index is not None:
+            cell_chars[index].append(char)
+
+    texts = {cell: (utils.extract_text(chs, **TEXT_SETTINGS) if chs else "")
+             for cell, chs in zip(cells, cell_chars)}
+
+    # Same row layout as pdfplumber's Table.rows: one slot per distinct x0
+    col_xs = sorted({c[0] for c in cells})
+    rows = []
+    for _, row_cells in groupby(sorted(cells, key=lambda c: (c[1], c[0])), key=lambda c: c[1]):
+        by_x = {c[0]: c for c in row_cells}
+        rows.append([texts[by_x[x]] if x in by_x else None for x in col_xs])
+    return rows
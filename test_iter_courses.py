@@ -0,0 +1,124 @@
+"""
+Course splitting in iter_courses, fed with table rows through a stub backend.
+
+Run with: python -m pytest -q
+"""
+import io
+
+import pytest
+from reportlab.pdfgen import canvas
+
+import pdf_syllabus_extractor as extractor
+from pdf_syllabus_extractor import _chain_ranges, extract_page_range, extract_syllabus, iter_courses
+
+HEADER = ["Subject Code", "Subject Name", "Credits", "CIA", "External", "Total"]
+ROMAN = ["I", "II", "III", "IV", "V"]
+
+
+class StubTables:
+    """Table backend returning fixed rows, one table per page."""
+
+    def __init__(self, pages):
+        self.pages = pages
+
+    def extract_tables(self, page):
+        return [self.pages[page.page_number - 1]]
+
+
+def blank_pdf(pages):
+    out = io.BytesIO()
+    c = canvas.Canvas(out)
+    for _ in range(pages):
+        c.showPage()
+    c.save()
+    return out.getvalue()
+
+
+def course_rows(code, units=5, header=True):
+    rows = [HEADER] if header else []
+    rows.append([code, "Medical Virology", "4", "25", "75", "100"])
+    rows.append(["Course Objectives", ""])
+    rows.append(["CO1", "To gain knowledge on properties and classification of viruses"])
+    rows.append(["Unit", "Details", "Hours", "Course Objectives"])
+    for numeral in ROMAN[:units]:
+        rows.append([numeral, f"Topic {numeral} one, topic {numeral} two (part a, part b)", "12", "CO1"])
+    rows.append(["", "Total", "60", ""])
+    rows.append(["Course Outcomes", ""])
+    rows.append(["CO1", "Students will be able to classify viruses by structure"])
+    rows.append(["Text Books", ""])
+    rows.append(["1", "Textbook of Medical Virology, 5th ed"])
+    rows.append(["Methods of Evaluation", ""])
+    rows.append(["CIA 1", "Written test", "25"])
+    return rows
+
+
+def paginate(rows, per_page, repeat=()):
+    """Split rows into pages, starting every page after the first with the repeat rows."""
+    pages = [rows[:per_page]]
+    for start in range(per_page, len(rows), per_page):
+        pages.append(list(repeat) + rows[start:start + per_page])
+    return pages
+
+
+def paginate_courses(courses, per_page):
+    """Split the courses' rows into pages, starting every page after the first with the header and code rows of the course it continues."""
+    rows = [row for course in courses for row in course]
+    owners = [course for course in courses for _ in course]
+    pages = [rows[:per_page]]
+    for start in range(per_page, len(rows), per_page):
+        pages.append(owners[start][:2] + rows[start:start + per_page])
+    return pages
+
+
+@pytest.fixture(autouse=True)
+def every_page_has_tables(monkeypatch):
+    # Blank pages would be skipped by the ruling-edge pre-scan
+    monkeypatch.setattr(extractor, "page_may_have_tables", lambda page: True)
+
+
+def courses(pages, **options):
+    return list(iter_courses(blank_pdf(len(pages)), backend=StubTables(pages), **options))
+
+
+def test_short_cell_before_header_does_not_close_course():
+    rows = [["Paper 12", "Semester III"]] + course_rows("336C5B")
+    data = extract_syllabus(blank_pdf(1), backend=StubTables([rows]))
+    assert len(data["units"]) == 5
+    assert data["course_outcomes"]
+    assert data["subject_info"]["total_marks"] == 100
+
+
+def test_repeated_header_rows_stay_in_one_course():
+    pages = paginate(course_rows("336C5B"), 4, repeat=[HEADER])
+    found = courses(pages)
+    assert [code for code, _ in found] == ["336C5B"]
+    assert len(found[0][1]["units"]) == 5
+    assert found[0][1]["resources"]["text_books"]
+
+
+def test_course_without_header_after_methods_of_evaluation():
+    rows = course_rows("336C5B") + course_rows("BIO-101", header=False) + course_rows("mb 301")
+    found = courses([rows])
+    assert [code for code, _ in found] == ["336C5B", "BIO-101", "mb 301"]
+    assert all(len(data["units"]) == 5 for _, data in found)
+
+
+def test_ignored_rows_are_counted():
+    stats = {}
+    rows = course_rows("336C5B") + [["Notes", "See the university calendar"]]
+    list(iter_courses(blank_pdf(1), stats, backend=StubTables([rows])))
+    assert stats["rows_ignored"] == 2
+
+
+@pytest.mark.parametrize("per_page", [3, 4, 5, 8])
+def test_page_ranges_match_serial_scan(per_page):
+    # Word repeats both the header and the code row on every page
+    pages = paginate_courses([course_rows("336C5B"), course_rows("300C0B")], per_page)
+    pdf = blank_pdf(len(pages))
+    backend = StubTables(pages)
+    serial = list(iter_courses(pdf, backend=backend))
+    assert [code for code, _ in serial] == ["336C5B", "300C0B"]
+    assert all(len(data["units"]) == 5 for _, data in serial)
+    ranges = [(page, page) for page in range(1, len(pages) + 1)]
+    results = ((extract_page_range(page_range, pdf, backend), None) for page_range in ranges)
+    assert list(_chain_ranges(results, ranges, "stub.pdf", {})) == serial
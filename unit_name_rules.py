@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "unit_name_rules.json")
+
+
+class UnitNameRules:
+    """
+    Compiled unit-name rules from a rule file.
+
+    Each rule has a name and a list of clauses; a clause is a list of
+    substrings that must all occur in the lowercased objective. The first rule
+    (in file order) with a satisfied clause wins. All distinct terms are
+    compiled into one trie-shaped lookahead regex that reports every term
+    occurrence in a single pass, and clauses are indexed by their most specific
+    term, so lookup cost depends on the text, not on how many rules there are.
+    Repeated objective texts are memoized.
+    """
+
+    def __init__(self, config, digest=""):
+        self.strip_prefixes = list(config.get("strip_prefixes", []))
+        self.fallback_words = config.get("fallback_words", 6)
+        self.digest = digest
+        self.rules = []
+        # Each clause is indexed under its longest (most specific) term only;
+        # it is checked in full when that term is found.
+        self.clauses_by_anchor = {}
+        terms = set()
+        for index, rule in enumerate(config.get("rules", [])):
+            clauses = [frozenset(term.lower() for term in clause) for clause in rule["match"]]
+            self.rules.append((rule["name"], clauses))
+            for clause in clauses:
+                anchor = max(clause, key=lambda t: (len(t), t))
+                self.clauses_by_anchor.setdefault(anchor, []).append((index, clause))
+                terms.update(clause)
+
+        # A zero-width lookahead is tried at every position and captures the
+        # longest term starting there; shorter terms at the same position are
+        # exactly its prefixes, which are precomputed here.
+        self.pattern = re.compile("(?=(" + _trie_pattern(terms) + "))") if terms else None
+        self.prefixes = {t: [p for p in _prefixes(t) if p in terms] for t in terms}
+        self.lookup = lru_cache(maxsize=65536)(self._lookup)
+
+    def matched_terms(self, text_lower):
+        found = set()
+        if self.pattern is not None:
+            for match in self.pattern.finditer(text_lower):
+                found.update(self.prefixes[match.group(1)])
+        return found
+
+    def _lookup(self, objective_text):
+        found = self.matched_terms(objective_text.lower())
+        best = None
+        for term in found:
+            for index, clause in self.clauses_by_anchor.get(term, ()):
+                if (best is None or index < best) and clause <= found:
+                    best = index
+        if best is not None:
+            return self.rules[best][0]
+        return self.fallback_name(objective_text)
+
+    def fallback_name(self, objective_text):
+        """Short title-cased name from the first words of the objective."""
+        # Remove common starter phrases
+        text = objective_text
+        for phrase in self.strip_prefixes:
+            if text.startswith(phrase):
+                text = text[len(phrase):].strip()
+                break
+
+        words = text.split()[:self.fallback_words]
+        short_name = ' '.join(words)
+        if short_name.endswith(','):
+            short_name = short_name[:-1]
+        if short_name.endswith('.'):
+            short_name = short_name[:-1]
+        return short_name.title()
+
+
+def _prefixes(term):
+    return [term[:i] for i in range(1, len(term) + 1)]
+
+
+def _trie_pattern(terms):
+    """
+    Regex matching the longest of terms at a position. Terms are merged into a
+    character trie so the engine follows one branch per character instead of
+    trying every alternative in turn, keeping matching cost independent of the
+    number of terms.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        end = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional: prefer continuing to a longer term, else stop here
+        return f"(?:{body})?" if end else body
+
+    return build(trie)
+
+
+def load_unit_name_rules(path=DEFAULT_RULES_PATH):
+    """Read and compile a rule file."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return UnitNameRules(json.loads(raw.decode('utf-8')), hashlib.sha256(raw).hexdigest())